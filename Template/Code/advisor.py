@@ -0,0 +1,193 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from cards import VALUE_OF
+from dealer_odds import DealerOdds, FINAL_TOTALS, BUST
+import strategy
+
+# BACKGROUND HAND ADVISOR
+# Works out the chance of winning, pushing and losing if the player stands
+# now, plus the suggested move, without blocking the table. MainWindow hands
+# over a snapshot of the game (plain immutable values, taken on the GUI
+# thread); the maths runs in a one-worker process pool and the result comes
+# back through a Qt signal, queued onto the GUI thread.
+#
+# The estimate is pure Python, so a worker thread would hold the GIL while
+# it runs and Hit / Stand could wait on it however the switch interval is
+# set. In its own process it never holds the GUI's GIL, and the worker runs
+# at a lower priority so the GUI goes first when cores are short - Hit /
+# Stand don't wait on an estimate however long it takes.
+#
+# Every request gets a new generation number. A newer request cancels work
+# that has not started and makes any running estimate's result stale, so
+# only the answer for the hand on screen is ever shown.
+#
+# The strategy table is built (or loaded) in the worker too: warm() asks for
+# it at start-up and the finished table is handed to strategy.add_table on
+# the GUI thread. The GUI only reads the table once strategy.loaded_table()
+# has it, so it never solves the table itself.
+
+
+def snapshot_hand(game):
+    """
+    What the advisor needs from a Game21, as a tuple of immutable values:
+    (player total, soft flag, dealer upcard, unseen cards per value class,
+    decks, rules). The dealer's hidden card counts as unseen.
+    """
+    hand = game.player_hand
+    return (hand.total, hand.is_soft, game.dealer_hand[1], game.unseen_value_counts(),
+            game.shoe.num_decks, game.rules)
+
+
+def estimate(snapshot, dealer_odds):
+    """
+    Exact win / push / lose chances for standing on the current total,
+    against the dealer's final total given the unseen cards, plus the
+    strategy table's suggested move. Slow on a cold cache - run it off the
+    GUI thread.
+    """
+    total, soft, upcard, counts, num_decks, rules = snapshot
+    dealer = dealer_odds.distribution(upcard, counts)
+
+    win = dealer[BUST]
+    push = 0.0
+    for final in FINAL_TOTALS:
+        if total > final:
+            win += dealer[final]
+        elif total == final:
+            push += dealer[final]
+
+    # strategy table uses card values (Ace = 11)
+    action = strategy.get_table(num_decks, rules=rules).action(total, soft, VALUE_OF[upcard])
+    return {"win": win, "push": push, "lose": max(0.0, 1.0 - win - push), "action": action}
+
+
+# WORKER PROCESS
+
+_dealer_odds = {}  # RuleSet -> DealerOdds, kept in the worker so the cache stays warm
+
+
+def _start_worker():
+    # on a machine with few cores the worker competes with the GUI for CPU
+    # time; a lower priority lets the GUI go first (not available on Windows)
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+def _estimate_in_worker(snapshot):
+    rules = snapshot[-1]
+    dealer_odds = _dealer_odds.get(rules)
+    if dealer_odds is None:
+        dealer_odds = _dealer_odds[rules] = DealerOdds(rules=rules)
+    return estimate(snapshot, dealer_odds)
+
+
+def _table_in_worker(num_decks, rules):
+    return strategy.get_table(num_decks, rules=rules)
+
+
+# GUI SIDE
+
+class _TaskSignals(QObject):
+    # futures finish on the executor's thread; these signals queue the
+    # results onto the GUI thread
+    finished = pyqtSignal(int, object)  # generation, result dict
+    table_ready = pyqtSignal(object)  # StrategyTable
+
+
+class Advisor(QObject):
+    """
+    Runs estimate() in a worker process for the latest hand only.
+    Connect to `result_ready`; call request(game) whenever the hand changes
+    and cancel() when the player's turn is over.
+    """
+
+    result_ready = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+
+        self.executor = self._new_executor()
+        self._pending = []  # estimate futures not finished yet
+        self._warming = set()  # (num_decks, hits soft 17) of tables being built
+
+        self.task_signals = _TaskSignals()
+        self.task_signals.finished.connect(self._on_finished)
+        self.task_signals.table_ready.connect(self._on_table_ready)
+
+    @staticmethod
+    def _new_executor():
+        # one worker: requests are handled in order. "spawn" starts a clean
+        # interpreter instead of forking a process that runs Qt threads.
+        # The process itself only starts with the first request.
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_start_worker)
+
+    def _submit(self, fn, *args):
+        try:
+            return self.executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # the worker died (e.g. killed) - start a new one and try once more
+            self.executor = self._new_executor()
+            return self.executor.submit(fn, *args)
+
+    def warm(self, num_decks, rules):
+        """
+        Build or load the strategy table in the worker, ahead of the first
+        hint or estimate.
+        """
+        key = (num_decks, rules.dealer_hits_soft_17)
+        if key in self._warming or strategy.loaded_table(num_decks, rules) is not None:
+            return
+        self._warming.add(key)
+        signals = self.task_signals
+
+        def done(future):
+            if not future.cancelled() and future.exception() is None:
+                signals.table_ready.emit(future.result())
+
+        self._submit(_table_in_worker, num_decks, rules).add_done_callback(done)
+
+    def request(self, game):
+        """
+        Start estimating the current hand (snapshot taken now, on the caller's thread).
+        """
+        self.cancel()
+        generation = self.generation
+        signals = self.task_signals
+
+        def done(future):
+            # runs on the executor's thread - only emit, the slot runs on the GUI thread
+            if not future.cancelled() and future.exception() is None:
+                signals.finished.emit(generation, future.result())
+
+        future = self._submit(_estimate_in_worker, snapshot_hand(game))
+        future.add_done_callback(done)
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(future)
+
+    def cancel(self):
+        # work for older hands that has not started never runs, and any
+        # result still on its way is ignored
+        self.generation += 1
+        for future in self._pending:
+            future.cancel()
+
+    def shutdown(self):
+        self.generation += 1
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _on_table_ready(self, table):
+        # runs on the GUI thread, so only that thread touches strategy's tables
+        strategy.add_table(table)
+        self._warming.discard((table.num_decks, table.hits_soft_17))
+
+    def _on_finished(self, generation, result):
+        # runs on the GUI thread (queued connection)
+        if generation == self.generation:
+            self.result_ready.emit(result)
@@ -0,0 +1,174 @@
+import numpy as np
+
+from batch_engine import play_rounds
+from cards import DECK_SIZE
+from shoe import HI_LO, MIN_DECKS, MAX_DECKS, worst_case_cards
+from shoe_factory import shuffled_shoes
+
+# BANKROLL SIMULATION
+# Many independent players ("paths") each sit at their own table with their
+# own shoe and bankroll. Every round is played for all paths at once with
+# batch_engine.play_rounds, so a run is one Python loop over rounds, never
+# over paths. Shoes persist between rounds (dealt to the cut card, then
+# reshuffled, like Game21), which is what lets a card-counting scheme work.
+# Like Game21.new_round, a shoe is also reshuffled early when the cards left
+# might not cover a whole round, so a round never runs past the end.
+#
+# Each path stops betting once its bankroll can no longer cover the minimum
+# bet (ruin). Results: risk of ruin, maximum-drawdown percentiles, final
+# bankroll percentiles and the expected result per hour of play.
+
+ROUNDS_PER_HOUR = 80  # one player at the table
+HI_LO_VALUES = np.array(HI_LO, dtype=np.int16)
+PERCENTILES = (50, 90, 95, 99)
+
+
+# SHOES
+
+def new_shoes(count, num_decks, rng):
+    """
+    `count` shuffled shoes of `num_decks` decks, one per row.
+    """
+    return shuffled_shoes(count, num_decks, rng)
+
+
+def running_counts(shoes):
+    """
+    Hi-Lo running count before each position: column p is the count of the
+    first p cards, so looking up a count is one index, whatever p is.
+    """
+    counts = np.zeros((len(shoes), shoes.shape[1] + 1), dtype=np.int16)
+    np.cumsum(HI_LO_VALUES[shoes], axis=1, out=counts[:, 1:])
+    return counts
+
+
+# BETTING SCHEMES
+# A scheme gets the per-path state and returns the wanted bet for every path
+# (before it is capped by the table maximum and the bankroll).
+
+def flat_bets(state, unit, max_bet):
+    return np.full(len(state["bankroll"]), unit, dtype=np.float64)
+
+
+def martingale_bets(state, unit, max_bet):
+    # double after every loss, back to one unit after a win
+    return unit * np.exp2(np.minimum(state["losses_in_row"], 30))
+
+
+def count_bets(state, unit, max_bet):
+    # Hi-Lo ramp: one unit at a true count of 1 or less, one more unit for
+    # every point above that
+    return unit * np.maximum(1.0, np.floor(state["true_count"]))
+
+
+BETTING_SCHEMES = {
+    "flat": flat_bets,
+    "martingale": martingale_bets,
+    "count": count_bets,
+}
+
+
+# SIMULATION
+
+def simulate_bankrolls(paths=10_000, rounds=1_000, bankroll=100.0, unit=1.0, max_bet=None,
+                       scheme="flat", num_decks=6, penetration=0.75, player_stand_on=17,
+                       rules=None, seed=None, rounds_per_hour=ROUNDS_PER_HOUR):
+    """
+    Play `rounds` rounds on `paths` independent bankrolls starting at
+    `bankroll`, betting by `scheme` in multiples of `unit` up to `max_bet`
+    (default 100 units). Returns a dict of summary figures (see summarize).
+    """
+    if scheme not in BETTING_SCHEMES:
+        raise ValueError(f"unknown scheme {scheme!r}, choose from {', '.join(BETTING_SCHEMES)}")
+    if not MIN_DECKS <= num_decks <= MAX_DECKS:
+        raise ValueError(f"num_decks must be between {MIN_DECKS} and {MAX_DECKS}")
+    if paths < 1 or rounds < 1:
+        raise ValueError("paths and rounds must be at least 1")
+    if not 0 < penetration <= 1:
+        # same range as Shoe
+        raise ValueError("penetration must be greater than 0 and at most 1")
+    if unit <= 0 or bankroll < unit:
+        raise ValueError("unit must be positive and the bankroll must cover one unit")
+
+    betting = BETTING_SCHEMES[scheme]
+    max_bet = 100 * unit if max_bet is None else max_bet
+    rng = np.random.default_rng(seed)
+
+    shoe_size = num_decks * DECK_SIZE
+    cut_card = int(shoe_size * penetration)
+    # last position a round may start from: before the cut card, and with
+    # room for the longest possible round (see Game21.new_round)
+    last_start = min(cut_card - 1, shoe_size - worst_case_cards(num_decks, 2))
+    shoes = new_shoes(paths, num_decks, rng)
+    counts = running_counts(shoes)
+    positions = np.zeros(paths, dtype=np.intp)
+    lanes = np.arange(paths)
+
+    state = {
+        "bankroll": np.full(paths, float(bankroll)),
+        "losses_in_row": np.zeros(paths, dtype=np.int32),
+        "true_count": np.zeros(paths),
+    }
+    money = state["bankroll"]
+    peak = money.copy()
+    max_drawdown = np.zeros(paths)
+    ruined = np.zeros(paths, dtype=bool)
+    rounds_played = np.zeros(paths, dtype=np.int64)
+    wagered = np.zeros(paths)
+
+    for _ in range(rounds):
+        # reshuffle the shoes that reached the cut card or the round reserve
+        rows = np.flatnonzero(positions > last_start)
+        if rows.size:
+            shoes[rows] = new_shoes(rows.size, num_decks, rng)
+            counts[rows] = running_counts(shoes[rows])
+            positions[rows] = 0
+
+        # true count = running count per deck left to deal (at least half a deck)
+        decks_left = np.maximum(shoe_size - positions, DECK_SIZE // 2) / DECK_SIZE
+        state["true_count"] = counts[lanes, positions] / decks_left
+
+        bets = np.minimum(np.minimum(betting(state, unit, max_bet), max_bet), money)
+        bets[ruined] = 0.0
+
+        nets = play_rounds(shoes, positions, player_stand_on, rules)[3]
+        money += bets * nets
+        wagered += bets
+        rounds_played += ~ruined
+
+        lost = nets < 0
+        state["losses_in_row"] = np.where(lost, state["losses_in_row"] + 1,
+                                          np.where(nets > 0, 0, state["losses_in_row"]))
+        np.maximum(peak, money, out=peak)
+        np.maximum(max_drawdown, peak - money, out=max_drawdown)
+        ruined |= money < unit
+
+    return summarize(money, bankroll, max_drawdown, ruined, rounds_played, wagered,
+                     rounds, rounds_per_hour)
+
+
+def summarize(final, start, max_drawdown, ruined, rounds_played, wagered, rounds,
+              rounds_per_hour=ROUNDS_PER_HOUR):
+    """
+    Summary figures for a finished run (money in the same units as the bankroll).
+    """
+    hours = rounds / rounds_per_hour
+    results = final - start
+    return {
+        "paths": len(final),
+        "rounds": rounds,
+        "hours": hours,
+        "risk_of_ruin": float(ruined.mean()),
+        "mean_final_bankroll": float(final.mean()),
+        "final_bankroll_percentiles": _percentiles(final),
+        "max_drawdown_percentiles": _percentiles(max_drawdown),
+        "hourly_result": float(results.mean() / hours),
+        "hourly_result_std": float(results.std() / hours),
+        # result per unit bet, i.e. the edge the scheme actually got
+        "result_per_wagered": float(results.sum() / max(wagered.sum(), 1e-12)),
+        "mean_rounds_played": float(rounds_played.mean()),
+    }
+
+
+def _percentiles(values):
+    return {str(p): float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
@@ -0,0 +1,163 @@
+import numpy as np
+
+from cards import CARD_VALUES, CARD_IS_ACE as ACE_FLAGS, DECK_SIZE
+from game_logic import (
+    PLAYER_BUST, DEALER_BUST, PLAYER_WIN, DEALER_WIN, PUSH, OUTCOME_MESSAGES, OUTCOME_NET
+)
+from rules import DEFAULT_RULES
+from shoe import worst_case_cards
+from shoe_factory import shuffled_shoes
+
+# Vectorised version of the Game21 rules.
+# Instead of playing one round at a time, every round is a row in a 2-D array
+# of shuffled decks, and each step (deal, hit, dealer draw) is applied to all
+# rows that still need it at once.
+
+# Cards are the integer codes from cards.py. Aces are stored as 1 (the "hard"
+# value); the extra 10 for a soft ace is added when the best total is needed.
+CARD_IS_ACE = np.array(ACE_FLAGS, dtype=bool)
+CARD_HARD_VALUES = np.where(CARD_IS_ACE, 1, np.array(CARD_VALUES)).astype(np.int16)
+NET_BY_OUTCOME = np.array(OUTCOME_NET, dtype=np.float32)
+
+
+def shuffled_decks(count, rng):
+    """
+    Return `count` independently shuffled 52-card decks as a (count, 52) array.
+    Each row is a permutation of the card codes 0..51.
+    """
+    return shuffled_shoes(count, 1, rng)
+
+
+def best_totals(hard, aces):
+    """
+    Same ace handling as Game21.hand_total: one Ace counts as 11
+    if that does not bust the hand.
+    """
+    return np.where(aces & (hard <= 11), hard + 10, hard)
+
+
+def _draw(shoes, rows, positions):
+    # Take the next card for the given rows and move their positions on
+    cards = shoes[rows, positions[rows]]
+    positions[rows] += 1
+    return CARD_HARD_VALUES[cards], CARD_IS_ACE[cards]
+
+
+def play_rounds(shoes, positions, player_stand_on=17, rules=None):
+    """
+    Play one round on every row of `shoes`, starting at `positions`.
+
+    The deal order matches deal_initial_cards(): two player cards,
+    then two dealer cards. The player hits until their total reaches
+    `player_stand_on`, the dealer draws by the rules' dealer hit table
+    (play_dealer_turn) and does not draw if the player has bust
+    (MainWindow.on_hit). The player never doubles or surrenders here.
+
+    `positions` is updated in place, so several rounds can be played
+    from the same shoes, as long as every row still has room for the
+    longest possible round (shoe.worst_case_cards) - the caller reshuffles
+    the rows that don't, like Game21.new_round; a ValueError is raised
+    otherwise. Returns (outcomes, player_totals, dealer_totals, nets),
+    nets being the bets won or lost per round (Game21.round_net).
+    """
+    room = worst_case_cards(max(shoes.shape[1] // DECK_SIZE, 1), 2)
+    if len(shoes) and (shoes.shape[1] - positions).min() < room:
+        raise ValueError(f"every shoe needs at least {room} cards left to play a round")
+
+    rules = rules or DEFAULT_RULES
+    dealer_hits = np.frombuffer(rules.dealer_hits, dtype=np.uint8).astype(bool)
+    count = len(shoes)
+    all_rows = np.arange(count)
+
+    player_hard = np.zeros(count, dtype=np.int16)
+    player_aces = np.zeros(count, dtype=bool)
+    dealer_hard = np.zeros(count, dtype=np.int16)
+    dealer_aces = np.zeros(count, dtype=bool)
+
+    for hard, aces in ((player_hard, player_aces), (player_hard, player_aces),
+                       (dealer_hard, dealer_aces), (dealer_hard, dealer_aces)):
+        values, is_ace = _draw(shoes, all_rows, positions)
+        hard += values
+        aces |= is_ace
+
+    # naturals only matter when the rules pay a blackjack bonus
+    player_natural = best_totals(player_hard, player_aces) == 21
+    dealer_natural = best_totals(dealer_hard, dealer_aces) == 21
+
+    # Player hits - only the rows that are still below the stand total
+    rows = np.flatnonzero(best_totals(player_hard, player_aces) < player_stand_on)
+    while rows.size:
+        values, is_ace = _draw(shoes, rows, positions)
+        player_hard[rows] += values
+        player_aces[rows] |= is_ace
+        rows = rows[best_totals(player_hard[rows], player_aces[rows]) < player_stand_on]
+
+    player_totals = best_totals(player_hard, player_aces)
+    player_bust = player_totals > 21
+
+    # Dealer draws while the hit table says so, unless the player has already
+    # bust; one lookup by (hard total, holds an Ace) whatever the rules
+    rows = np.flatnonzero(~player_bust & dealer_hits[dealer_hard * 2 + dealer_aces])
+    while rows.size:
+        values, is_ace = _draw(shoes, rows, positions)
+        dealer_hard[rows] += values
+        dealer_aces[rows] |= is_ace
+        rows = rows[dealer_hits[dealer_hard[rows] * 2 + dealer_aces[rows]]]
+
+    dealer_totals = best_totals(dealer_hard, dealer_aces)
+
+    # Same order of checks as decide_winner()
+    outcomes = np.select(
+        [player_bust,
+         dealer_totals > 21,
+         player_totals > dealer_totals,
+         dealer_totals > player_totals],
+        [PLAYER_BUST, DEALER_BUST, PLAYER_WIN, DEALER_WIN],
+        default=PUSH,
+    ).astype(np.uint8)
+    nets = NET_BY_OUTCOME[outcomes]
+
+    if rules.blackjack_payout:
+        # a natural beats any other dealer hand and pays the bonus
+        bonus = player_natural & ~dealer_natural
+        outcomes[bonus] = PLAYER_WIN
+        nets[bonus] = rules.blackjack_payout
+
+    return outcomes, player_totals.astype(np.uint8), dealer_totals.astype(np.uint8), nets
+
+
+def simulate_batch(rounds, seed=None, player_stand_on=17, chunk_size=200_000, rules=None):
+    """
+    Play `rounds` independent rounds, each from a freshly shuffled deck
+    (like Game21.new_round), in chunks of `chunk_size` rows.
+
+    Returns a dict with:
+    - "counts": number of rounds per outcome message
+    - "mean_net": average bets won per round under `rules`
+    - "outcomes", "player_totals", "dealer_totals": one entry per round
+    """
+    rng = np.random.default_rng(seed)
+    net_total = 0.0
+
+    outcomes = np.empty(rounds, dtype=np.uint8)
+    player_totals = np.empty(rounds, dtype=np.uint8)
+    dealer_totals = np.empty(rounds, dtype=np.uint8)
+
+    for start in range(0, rounds, chunk_size):
+        stop = min(start + chunk_size, rounds)
+        shoes = shuffled_decks(stop - start, rng)
+        positions = np.zeros(stop - start, dtype=np.intp)
+        (outcomes[start:stop],
+         player_totals[start:stop],
+         dealer_totals[start:stop],
+         nets) = play_rounds(shoes, positions, player_stand_on, rules)
+        net_total += float(nets.sum(dtype=np.float64))
+
+    counts = np.bincount(outcomes, minlength=len(OUTCOME_MESSAGES))
+    return {
+        "counts": {message: int(n) for message, n in zip(OUTCOME_MESSAGES, counts)},
+        "mean_net": net_total / rounds if rounds else 0.0,
+        "outcomes": outcomes,
+        "player_totals": player_totals,
+        "dealer_totals": dealer_totals,
+    }
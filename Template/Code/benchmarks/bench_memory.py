@@ -0,0 +1,69 @@
+"""
+Memory benchmark: bytes per live session, Game21 against CompactGame21.
+
+Run from the Code folder:
+    python benchmarks/bench_memory.py [sessions]
+
+Each session has a round dealt (two cards each) so the hands are filled in,
+as they would be for connected players. Memory is measured with tracemalloc
+and divided by the number of sessions.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+
+from compact import CompactGame21, ShoeArena
+from game_logic import Game21
+
+SESSIONS = 100_000
+
+
+def bytes_per_session(make_session, sessions):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    live = []
+    for i in range(sessions):
+        game = make_session(i)
+        game.deal_initial_cards()
+        live.append(game)
+
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # the list holding the sessions is not part of a session
+    used -= sys.getsizeof(live)
+    del live
+    return used / sessions
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sessions = int(argv[0]) if argv else SESSIONS
+
+    arena = ShoeArena()
+    cases = [
+        ("Game21", lambda i: Game21()),
+        ("Game21 (seeded)", lambda i: Game21(seed=i)),
+        ("CompactGame21 (shared arena)", lambda i: CompactGame21(shoes=arena)),
+    ]
+
+    print(f"{sessions:,} sessions, one round dealt each")
+    results = {}
+    for name, make_session in cases:
+        results[name] = bytes_per_session(make_session, sessions)
+        print(f"  {name:<30} {results[name]:>8,.0f} bytes/session")
+
+    before = results["Game21"]
+    after = results["CompactGame21 (shared arena)"]
+    print(f"  compact sessions use {after / before:.1%} of the memory "
+          f"({before / after:.1f}x fewer bytes)")
+
+
+if __name__ == "__main__":
+    main()
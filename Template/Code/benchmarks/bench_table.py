@@ -0,0 +1,72 @@
+"""
+Table benchmark: rounds per second as seats are added to one table.
+
+Run from the Code folder:
+    python benchmarks/bench_table.py [--rounds N] [--decks N] [--json]
+
+Every seat stands on 17. A table round deals every seat from one slice of
+the shoe and plays the dealer once, so adding seats should cost far less
+than playing each seat as its own Game21. Single-seat Game21 throughput
+(the same headless round as run_benchmarks.py) is shown for reference.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+
+from game_logic import Game21
+from simulation import play_round, stand_on_17
+from table import Table, MAX_SEATS
+
+ROUNDS = 20_000
+REPEAT = 5
+
+
+def rounds_per_second(play, rounds, repeat=REPEAT):
+    # fastest of `repeat` runs, the least disturbed by other work on the machine
+    return rounds / min(timeit.Timer(play).repeat(repeat, rounds))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-seat table throughput")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="rounds per seat count")
+    parser.add_argument("--decks", type=int, default=6, help="decks in the shoe (default 6)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    game = Game21(args.decks, seed=1)
+    single = rounds_per_second(lambda: play_round(game, stand_on_17), args.rounds)
+
+    results = {"game21_rounds_per_s": single, "tables": []}
+    for seats in range(1, MAX_SEATS + 1):
+        table = Table(seats, args.decks, seed=1)
+        rate = rounds_per_second(table.play_round, args.rounds)
+        if seats == 1:
+            one_seat = rate
+        results["tables"].append({
+            "seats": seats,
+            "rounds_per_s": rate,
+            "hands_per_s": rate * seats,
+            "vs_one_seat": rate / one_seat,
+            "vs_game21": rate / single,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.rounds:,} rounds per case (best of {REPEAT}), {args.decks} decks, "
+          f"seats stand on 17")
+    print(f"  Game21 (one seat)  {single:>10,.0f} rounds/s")
+    print(f"  {'seats':>5} {'rounds/s':>12} {'hands/s':>12} {'vs 1 seat':>10} {'vs Game21':>10}")
+    for row in results["tables"]:
+        print(f"  {row['seats']:>5} {row['rounds_per_s']:>12,.0f} {row['hands_per_s']:>12,.0f} "
+              f"{row['vs_one_seat']:>10.0%} {row['vs_game21']:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
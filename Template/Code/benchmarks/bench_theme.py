@@ -0,0 +1,54 @@
+"""
+Micro-benchmark: restyle cost as display settings change again and again.
+
+Run from the Code folder:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_theme.py
+
+Each batch toggles card size / contrast and cycles the status outcomes.
+The time per change and the stylesheet length should stay flat from the
+first batch to the last.
+"""
+import os
+import sys
+import time
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+os.chdir(CODE_DIR)  # main.py loads images with relative paths
+
+from PyQt6.QtWidgets import QApplication
+
+BATCHES = 10
+CHANGES_PER_BATCH = 100
+OUTCOMES = ("Player wins!", "Dealer wins!", "Push (tie).", "neutral")
+
+
+def main():
+    app = QApplication(sys.argv)
+    from main import MainWindow
+
+    window = MainWindow()
+    window.show()
+    app.processEvents()
+
+    print(f"{'batch':>5} {'settings ms':>12} {'status ms':>10} {'sheet chars':>12}")
+    for batch in range(BATCHES):
+        start = time.perf_counter()
+        for i in range(CHANGES_PER_BATCH):
+            window.card_font_size = 20 + i % 4
+            window.high_contrast = bool(i % 2)
+            window.apply_ui_sizes()
+            app.processEvents()
+        settings_ms = (time.perf_counter() - start) * 1000 / CHANGES_PER_BATCH
+
+        start = time.perf_counter()
+        for i in range(CHANGES_PER_BATCH):
+            window.set_status_style(OUTCOMES[i % len(OUTCOMES)])
+            app.processEvents()
+        status_ms = (time.perf_counter() - start) * 1000 / CHANGES_PER_BATCH
+
+        print(f"{batch:>5} {settings_ms:>12.3f} {status_ms:>10.3f} {len(window.styleSheet()):>12}")
+
+
+if __name__ == "__main__":
+    main()
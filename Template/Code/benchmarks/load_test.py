@@ -0,0 +1,130 @@
+"""
+Load test for the asyncio game server (server.py).
+
+Opens many concurrent sessions, each playing a number of rounds
+(new, hit below 17, stand) and reports request latency percentiles
+and session throughput.
+
+Run from the Code folder, against a running server:
+    python -m server --port 8021 &
+    python benchmarks/load_test.py --sessions 2000 --concurrency 500 --rounds 5
+
+or with the server in the same process and event loop (one core in total):
+    python benchmarks/load_test.py --in-process
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+
+
+async def run_session(open_connection, rounds, latencies):
+    reader, writer = await open_connection()
+
+    async def request(command):
+        start = time.perf_counter()
+        writer.write(command + b"\n")
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    try:
+        for _ in range(rounds):
+            reply = await request(b"new")
+            while reply["result"] is None and reply["player_total"] < 17:
+                reply = await request(b"hit")
+            if reply["result"] is None:
+                await request(b"stand")
+        writer.write(b"quit\n")
+    finally:
+        writer.close()
+
+
+async def run_load(args):
+    server = None
+    if args.in_process:
+        from server import GameServer
+        server = await GameServer(compact=args.compact).start(args.host, args.port, args.unix)
+
+    if args.unix:
+        def open_connection():
+            return asyncio.open_unix_connection(args.unix)
+    else:
+        def open_connection():
+            return asyncio.open_connection(args.host, args.port)
+
+    latencies = []
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def limited_session():
+        async with limit:
+            await run_session(open_connection, args.rounds, latencies)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited_session() for _ in range(args.sessions)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    return latencies, elapsed, failures
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test for the Game of 21 server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8021)
+    parser.add_argument("--unix", metavar="PATH", help="connect over a Unix socket")
+    parser.add_argument("--sessions", type=int, default=1000, help="sessions to run (default 1000)")
+    parser.add_argument("--concurrency", type=int, default=250,
+                        help="sessions open at the same time (default 250)")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per session (default 5)")
+    parser.add_argument("--in-process", action="store_true",
+                        help="start the server inside this process first")
+    parser.add_argument("--compact", action="store_true",
+                        help="with --in-process: use compact sessions")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+    args = parser.parse_args(argv)
+
+    latencies, elapsed, failures = asyncio.run(run_load(args))
+    latencies.sort()
+    report = {
+        "sessions": args.sessions,
+        "failed_sessions": len(failures),
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "sessions_per_second": (args.sessions - len(failures)) / elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:>20}: {value:.3f}" if isinstance(value, float) else f"{key:>20}: {value}")
+        if failures:
+            print(f"first failure: {failures[0]!r}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Benchmark suite for the game logic hot paths and a full round.
+
+Run from the Code folder:
+    python benchmarks/run_benchmarks.py                  run, save, compare with baseline
+    python benchmarks/run_benchmarks.py --save-baseline  also store this run as the baseline
+    python benchmarks/run_benchmarks.py --only micro     micro or macro benchmarks only
+
+Micro benchmarks time single Game21 calls; macro benchmarks time a headless
+round, one million rounds through the batch engine (needs numpy) and an
+offscreen MainWindow round (needs PyQt6). Games are seeded, so every run
+plays the same cards. Each benchmark is repeated and the fastest repeat is
+kept, which is the least disturbed by other work on the machine.
+
+Results go to benchmarks/results.json. With a baseline
+(benchmarks/baseline.json) each result is shown as a percentage diff;
+positive means slower than the baseline.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CODE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, CODE_DIR)
+
+from game_logic import Game21
+from hand import Hand
+from simulation import play_round, stand_on_17
+
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+REPEAT = 5
+REGRESSION_THRESHOLD = 10.0  # percent slower before a result is flagged
+
+# fixed two-card starts for the dealer benchmark (cycled through)
+DEALER_STARTS = (("6♠", "5♥"), ("10♦", "6♣"), ("A♠", "5♦"), ("2♥", "3♣"), ("9♠", "8♦"))
+HANDS = (["A♠", "K♥"], ["A♠", "A♥", "9♣"], ["10♦", "6♣", "5♠"], ["2♥", "3♣", "4♦", "5♠", "6♥"])
+
+
+def best_time(func, number, repeat=REPEAT):
+    """
+    Seconds per call of `func` (best of `repeat` runs of `number` calls).
+    """
+    return min(timeit.Timer(func).repeat(repeat, number)) / number
+
+
+# MICRO BENCHMARKS
+
+def bench_create_deck(scale):
+    game = Game21(seed=1)
+    return best_time(game.create_deck, 20_000 * scale)
+
+
+def bench_draw_card(scale):
+    game = Game21(seed=1)
+    return best_time(game.draw_card, 200_000 * scale)
+
+
+def bench_card_value(scale):
+    game = Game21(seed=1)
+    deck = game.create_deck()
+    card_value = game.card_value
+
+    def all_cards():
+        for card in deck:
+            card_value(card)
+
+    return best_time(all_cards, 5_000 * scale) / len(deck)
+
+
+def bench_hand_total(scale):
+    game = Game21(seed=1)
+    hand_total = game.hand_total
+
+    def all_hands():
+        for hand in HANDS:
+            hand_total(hand)
+
+    return best_time(all_hands, 50_000 * scale) / len(HANDS)
+
+
+def bench_play_dealer_turn(scale):
+    game = Game21(seed=1)
+    starts = [Hand(cards) for cards in DEALER_STARTS]
+    state = {"i": 0}
+
+    def dealer_turn():
+        # fresh copy of a fixed start, then the dealer plays it out
+        state["i"] = (state["i"] + 1) % len(starts)
+        game.dealer_hand = Hand(starts[state["i"]])
+        game.play_dealer_turn()
+        if game.shoe.needs_shuffle:
+            game.shoe.shuffle()
+
+    return best_time(dealer_turn, 50_000 * scale)
+
+
+def bench_decide_winner(scale):
+    game = Game21(seed=1)
+    game.player_hand = Hand(["10♦", "8♣"])
+    game.dealer_hand = Hand(["9♠", "8♦"])
+    return best_time(game.decide_winner, 200_000 * scale)
+
+
+# MACRO BENCHMARKS
+
+def bench_headless_round(scale):
+    game = Game21(seed=1)
+    return best_time(lambda: play_round(game, stand_on_17), 20_000 * scale)
+
+
+def bench_batch_1m_rounds(scale):
+    try:
+        from batch_engine import simulate_batch
+    except ImportError:
+        return None  # numpy not installed
+    return best_time(lambda: simulate_batch(1_000_000, seed=0), 1, repeat=3)
+
+
+def bench_ui_round(scale):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # the offscreen plugin warns about size hints on every window resize
+    os.environ.setdefault("QT_LOGGING_RULES", "default.warning=false")
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        return None
+
+    # main.py loads images with relative paths
+    cwd = os.getcwd()
+    os.chdir(CODE_DIR)
+    try:
+        app = QApplication.instance() or QApplication(sys.argv)
+        from main import MainWindow
+
+        window = MainWindow()
+        window.game = Game21(seed=1)
+        window.show()
+        app.processEvents()
+
+        def ui_round():
+            window.on_new_round()
+            window.on_hit()
+            if window.standButton.isEnabled():
+                window.on_stand()
+            app.processEvents()
+
+        result = best_time(ui_round, 200 * scale)
+        window.close()
+        return result
+    finally:
+        os.chdir(cwd)
+
+
+BENCHMARKS = {
+    "micro": {
+        "create_deck": bench_create_deck,
+        "draw_card": bench_draw_card,
+        "card_value": bench_card_value,
+        "hand_total": bench_hand_total,
+        "play_dealer_turn": bench_play_dealer_turn,
+        "decide_winner": bench_decide_winner,
+    },
+    "macro": {
+        "headless_round": bench_headless_round,
+        "batch_1m_rounds": bench_batch_1m_rounds,
+        "ui_round": bench_ui_round,
+    },
+}
+
+
+# RESULTS AND BASELINE
+
+def run(groups, scale):
+    results = {}
+    for group in groups:
+        for name, bench in BENCHMARKS[group].items():
+            seconds = bench(scale)
+            results[name] = {"group": group, "seconds": seconds}
+    return results
+
+
+def load_results(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["benchmarks"]
+    except FileNotFoundError:
+        return None
+
+
+def save_results(path, results):
+    data = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def percent_diff(seconds, baseline_seconds):
+    return (seconds - baseline_seconds) / baseline_seconds * 100
+
+
+def format_time(seconds):
+    if seconds is None:
+        return "skipped"
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.3f} {unit}"
+    return f"{seconds * 1e9:.1f} ns"
+
+
+def report(results, baseline, out=sys.stdout):
+    """
+    Print one line per benchmark. Returns the names that got slower than
+    the baseline by more than REGRESSION_THRESHOLD percent.
+    """
+    regressions = []
+    print(f"{'benchmark':<20} {'time':>12} {'baseline':>12} {'diff':>9}", file=out)
+    for name, result in results.items():
+        seconds = result["seconds"]
+        base = (baseline or {}).get(name, {}).get("seconds")
+        line = f"{name:<20} {format_time(seconds):>12}"
+        if seconds is not None and base:
+            diff = percent_diff(seconds, base)
+            line += f" {format_time(base):>12} {diff:>+8.1f}%"
+            if diff > REGRESSION_THRESHOLD:
+                line += "  slower"
+                regressions.append(name)
+        print(line, file=out)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Game of 21 benchmark suite")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), help="run one group only")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="multiply iteration counts (default 1)")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to save the results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline to compare with")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    groups = [args.only] if args.only else list(BENCHMARKS)
+    start = time.perf_counter()
+    results = run(groups, args.scale)
+
+    baseline = load_results(args.baseline)
+    regressions = report(results, baseline)
+    print(f"\n{len(results)} benchmarks in {time.perf_counter() - start:.1f} s")
+
+    save_results(args.output, results)
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"baseline saved to {args.baseline}")
+    elif baseline is None:
+        print("no baseline yet - run with --save-baseline to store one")
+    if regressions:
+        print(f"slower than baseline by more than {REGRESSION_THRESHOLD:g}%: "
+              f"{', '.join(regressions)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
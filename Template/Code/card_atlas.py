@@ -0,0 +1,92 @@
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from cards import CARD_NAMES
+
+# CARD PIXMAP ATLAS
+# Every card face (plus the face-down card) is drawn once into a QPixmap for
+# the current card size / contrast setting. Dealing a card then only sets a
+# ready pixmap on a label - no stylesheet matching or text layout per card.
+# Atlases already drawn are kept per setting, so toggling high contrast (or
+# going back to an earlier size) swaps the dict instead of redrawing.
+# The look matches the old QLabel[card="true"] stylesheet rules.
+
+CARD_WIDTH = 114  # 90px content + padding + border of the old card style
+CARD_HEIGHT = 146
+CARD_RADIUS = 12
+
+BACK = "??"  # face-down card text used by MainWindow
+
+CARD_BACKGROUND = "#ffffff"
+TEXT_COLOUR = "#000000"
+RED_TEXT_COLOUR = "#e74c3c"
+RED_SUITS = ("♥", "♦")
+
+
+class CardAtlas:
+    """
+    Cache of card pixmaps, one set per (card font size, high contrast)
+    setting; `style` is the setting currently in use.
+    """
+
+    def __init__(self):
+        self.style = None
+        self._pixmaps = {}
+        self._atlases = {}  # style -> {card text: pixmap}
+
+    def set_style(self, card_font_size, high_contrast):
+        """
+        Switch to the atlas for this setting, rendering it the first time.
+        Returns True when the pixmaps were replaced.
+        """
+        style = (card_font_size, high_contrast)
+        if style == self.style:
+            return False
+
+        self.style = style
+        pixmaps = self._atlases.get(style)
+        if pixmaps is None:
+            pixmaps = self._atlases[style] = {
+                text: self._render(text) for text in CARD_NAMES + (BACK,)
+            }
+        self._pixmaps = pixmaps
+        return True
+
+    def pixmap(self, card_text):
+        return self._pixmaps[card_text]
+
+    def _render(self, card_text):
+        card_font_size, high_contrast = self.style
+        border_colour = "#000000" if high_contrast else "#2c3e50"
+        border_width = 3 if high_contrast else 2
+
+        # draw at the screen's pixel density so cards stay sharp on HiDPI displays
+        screen = QApplication.primaryScreen()
+        ratio = screen.devicePixelRatio() if screen else 1.0
+        pixmap = QPixmap(round(CARD_WIDTH * ratio), round(CARD_HEIGHT * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+
+        # card-like rectangle
+        inset = border_width / 2
+        rect = QRectF(inset, inset, CARD_WIDTH - border_width, CARD_HEIGHT - border_width)
+        painter.setPen(QPen(QColor(border_colour), border_width))
+        painter.setBrush(QColor(CARD_BACKGROUND))
+        painter.drawRoundedRect(rect, CARD_RADIUS, CARD_RADIUS)
+
+        # red text for hearts & diamonds
+        red = card_text != BACK and card_text[-1] in RED_SUITS
+        painter.setPen(QColor(RED_TEXT_COLOUR if red else TEXT_COLOUR))
+        font = QFont()
+        font.setPixelSize(card_font_size)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, card_text)
+
+        painter.end()
+        return pixmap
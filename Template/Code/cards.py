@@ -0,0 +1,68 @@
+# COMPACT CARD ENCODING
+# Every card can also be stored as a small integer code 0..51 instead of a
+# text string like '10♥'. The code follows the create_deck() order
+# (rank outer, suit inner), so rank index = code // 4 and suit index = code % 4.
+# All values are looked up from tables built once at import time,
+# so nothing is sliced or parsed while a round is being played.
+
+RANKS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+SUITS = ("♠", "♥", "♦", "♣")
+DECK_SIZE = len(RANKS) * len(SUITS)
+
+# rank index -> card value (Ace counted as 11, like Game21.card_value)
+RANK_VALUES = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+# code -> text, value and ace flag
+CARD_NAMES = tuple(f"{rank}{suit}" for rank in RANKS for suit in SUITS)
+CARD_VALUES = tuple(RANK_VALUES[code // 4] for code in range(DECK_SIZE))
+CARD_IS_ACE = tuple(code // 4 == 0 for code in range(DECK_SIZE))
+# code -> value with an Ace counted as 1 (a hand's hard total)
+CARD_HARD_VALUES = bytes(1 if CARD_IS_ACE[code] else CARD_VALUES[code] for code in range(DECK_SIZE))
+
+# text -> code
+CARD_CODES = {name: code for code, name in enumerate(CARD_NAMES)}
+
+# Lookups that accept either form of a card (text or integer code),
+# so Game21 can work with both without checking the type.
+VALUE_OF = {}
+IS_ACE = {}
+for _code, _name in enumerate(CARD_NAMES):
+    VALUE_OF[_code] = VALUE_OF[_name] = CARD_VALUES[_code]
+    IS_ACE[_code] = IS_ACE[_name] = CARD_IS_ACE[_code]
+del _code, _name
+
+
+def card_to_str(code):
+    """
+    Convert an integer card code into its display text, e.g. 37 -> '10♥'.
+    """
+    return CARD_NAMES[code]
+
+
+def str_to_card(text):
+    """
+    Convert a card text such as 'K♦' into its integer code.
+    """
+    return CARD_CODES[text]
+
+
+def encode_cards(texts):
+    """
+    Convert a list of card strings into a compact bytearray of codes.
+    """
+    return bytearray(CARD_CODES[text] for text in texts)
+
+
+def decode_cards(codes):
+    """
+    Convert card codes back into the card strings used by the UI.
+    """
+    return [CARD_NAMES[code] for code in codes]
+
+
+def new_deck():
+    """
+    Return an unshuffled 52-card deck as a bytearray of card codes.
+    A bytearray is cheap to copy, hash (via bytes()) and store.
+    """
+    return bytearray(range(DECK_SIZE))
@@ -0,0 +1,284 @@
+"""
+Headless command line for Game of 21.
+
+Plays or simulates rounds with game_logic.Game21 only - PyQt6 is never
+imported, so it starts quickly and runs on machines without a display.
+
+Examples (from the Code folder):
+    python -m cli play --rounds 5 --seed 1
+    python -m cli simulate --rounds 1000000 --policy basic --workers 8 --json
+    python -m cli simulate --rounds 100000 --rules casino-h17
+    python -m cli play --rounds 1000 --seed 1 --log rounds.bin
+    python -m cli log-stats rounds.bin
+    python -m cli replay rounds.bin
+    python -m cli bankroll --scheme count --paths 10000 --rounds 1000 --decks 6
+    python -m cli edge --policy basic --rules casino --decks 6 --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+
+from game_logic import Game21, OUTCOME_MESSAGES
+from rules import VARIANTS
+from simulation import POLICIES, play_round, simulate
+
+
+def parse_seed(text):
+    # numeric seeds stay integers, so they are stored as-is in round logs
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--rounds", type=int, default=1, help="number of rounds (default 1)")
+    common.add_argument("--seed", type=parse_seed, default=None, help="seed for a reproducible run")
+    common.add_argument("--policy", choices=sorted(POLICIES), default="stand17",
+                        help="how the player decides to hit (default stand17)")
+    common.add_argument("--decks", type=int, default=1, help="decks in the shoe, 1-8 (default 1)")
+    common.add_argument("--penetration", type=float, default=0.75,
+                        help="fraction of the shoe dealt before reshuffling (default 0.75)")
+    common.add_argument("--rules", choices=list(VARIANTS), default="classic",
+                        help="table rules (default classic, see rules.py)")
+    common.add_argument("--json", action="store_true", help="print JSON instead of text")
+
+    play_parser = subparsers.add_parser("play", parents=[common], help="play rounds and print every hand")
+    play_parser.add_argument("--log", metavar="PATH", help="append every round to a binary round log")
+
+    simulate_parser = subparsers.add_parser("simulate", parents=[common],
+                                            help="simulate rounds and print statistics")
+    simulate_parser.add_argument("--workers", type=int, default=1,
+                                 help="worker processes (default 1)")
+    simulate_parser.add_argument("--target-precision", type=float, default=None, metavar="HALF_WIDTH",
+                                 help="stop once the 95%% interval of the mean net result "
+                                      "is within +/- HALF_WIDTH (--rounds is then the limit)")
+    simulate_parser.add_argument("--bulk-shuffle", action="store_true",
+                                 help="deal from shoes shuffled in bulk with numpy")
+
+    bankroll_parser = subparsers.add_parser(
+        "bankroll", help="simulate many bankrolls under a betting scheme (needs numpy)")
+    bankroll_parser.add_argument("--scheme", choices=["flat", "martingale", "count"], default="flat",
+                                 help="betting scheme (default flat)")
+    bankroll_parser.add_argument("--paths", type=int, default=10_000,
+                                 help="independent bankrolls (default 10000)")
+    bankroll_parser.add_argument("--rounds", type=int, default=1_000,
+                                 help="rounds per bankroll (default 1000)")
+    bankroll_parser.add_argument("--bankroll", type=float, default=100.0,
+                                 help="starting bankroll (default 100)")
+    bankroll_parser.add_argument("--unit", type=float, default=1.0, help="minimum bet (default 1)")
+    bankroll_parser.add_argument("--max-bet", type=float, default=None,
+                                 help="table maximum (default 100 units)")
+    bankroll_parser.add_argument("--stand-on", type=int, default=17,
+                                 help="player stands on this total or more (default 17)")
+    bankroll_parser.add_argument("--decks", type=int, default=6, help="decks in the shoe (default 6)")
+    bankroll_parser.add_argument("--penetration", type=float, default=0.75,
+                                 help="fraction of the shoe dealt before reshuffling (default 0.75)")
+    bankroll_parser.add_argument("--rules", choices=list(VARIANTS), default="classic",
+                                 help="table rules (default classic)")
+    bankroll_parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible run")
+    bankroll_parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+
+    edge_parser = subparsers.add_parser(
+        "edge", help="exact expected result of a round, by enumerating every deal")
+    edge_parser.add_argument("--policy", choices=sorted(POLICIES), default="stand17",
+                             help="player policy (default stand17)")
+    edge_parser.add_argument("--decks", type=int, default=1, help="decks in the shoe, 1-8 (default 1)")
+    edge_parser.add_argument("--rules", choices=list(VARIANTS), default="classic",
+                             help="table rules (default classic)")
+    edge_parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1)")
+    edge_parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+
+    log_parser = subparsers.add_parser("log-stats", help="win and bust rates from a round log")
+    log_parser.add_argument("path")
+    log_parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+
+    replay_parser = subparsers.add_parser("replay", help="replay a round log and report mismatches")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--decks", type=int, default=1, help="decks the log was played with")
+    replay_parser.add_argument("--penetration", type=float, default=0.75,
+                               help="penetration the log was played with")
+    replay_parser.add_argument("--rules", choices=list(VARIANTS), default="classic",
+                               help="rules the log was played with")
+    replay_parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+    return parser
+
+
+def run_play(args, out):
+    round_log = None
+    if args.log:
+        from round_log import RoundLogWriter
+        round_log = RoundLogWriter(args.log)
+
+    try:
+        play_rounds(args, out, Game21(args.decks, args.penetration, seed=args.seed,
+                                      round_log=round_log, rules=VARIANTS[args.rules]))
+    finally:
+        if round_log is not None:
+            round_log.close()
+
+
+def play_rounds(args, out, game):
+    policy = POLICIES[args.policy]
+
+    for number in range(1, args.rounds + 1):
+        outcome = play_round(game, policy)
+        if args.json:
+            out.write(json.dumps({
+                "round": number,
+                "player": list(game.player_hand),
+                "dealer": list(game.dealer_hand),
+                "player_total": game.player_total(),
+                "dealer_total": game.dealer_total(),
+                "result": OUTCOME_MESSAGES[outcome],
+            }, ensure_ascii=False) + "\n")
+        else:
+            out.write(
+                f"{number}: Player {' '.join(game.player_hand)} ({game.player_total()}) | "
+                f"Dealer {' '.join(game.dealer_hand)} ({game.dealer_total()}) | "
+                f"{OUTCOME_MESSAGES[outcome]}\n"
+            )
+
+    if not args.json:
+        out.write(f"Player wins: {game.player_wins}  Dealer wins: {game.dealer_wins}  "
+                  f"Pushes: {game.pushes}\n")
+
+
+def run_simulate(args, out):
+    seed = args.seed if args.seed is not None else 0
+    result = simulate(args.rounds, seed=seed, workers=args.workers, policy=args.policy,
+                      num_decks=args.decks, penetration=args.penetration,
+                      target_half_width=args.target_precision, rules=VARIANTS[args.rules],
+                      bulk_shuffle=args.bulk_shuffle)
+    stats = result.pop("stats")
+
+    if args.json:
+        result.update(stats.to_dict())
+        result["config"] = {
+            "seed": seed, "policy": args.policy, "rules": args.rules, "decks": args.decks,
+            "penetration": args.penetration, "workers": args.workers,
+            "target_precision": args.target_precision, "bulk_shuffle": args.bulk_shuffle,
+        }
+        out.write(json.dumps(result) + "\n")
+        return
+
+    rounds = max(result["rounds"], 1)
+    out.write(f"Rounds: {result['rounds']}\n")
+    for key, label in (("player_wins", "Player wins"), ("dealer_wins", "Dealer wins"),
+                       ("pushes", "Pushes")):
+        out.write(f"{label}: {result[key]} ({100 * result[key] / rounds:.2f}%)\n")
+    width = max(map(len, OUTCOME_MESSAGES)) + 2
+    for message, count in zip(OUTCOME_MESSAGES, result["outcomes"]):
+        out.write(f"  {message:<{width}}{count}\n")
+
+    low, high = stats.confidence_interval()
+    out.write(f"Mean net per round: {stats.mean:+.4f} (95% CI {low:+.4f} to {high:+.4f})\n")
+    out.write(f"Longest streaks: {stats.longest_win_streak} wins, "
+              f"{stats.longest_loss_streak} losses\n")
+
+
+def run_bankroll(args, out):
+    # NumPy is only needed (and imported) for the bankroll simulator
+    from bankroll import simulate_bankrolls
+
+    summary = simulate_bankrolls(
+        paths=args.paths, rounds=args.rounds, bankroll=args.bankroll, unit=args.unit,
+        max_bet=args.max_bet, scheme=args.scheme, num_decks=args.decks,
+        penetration=args.penetration, player_stand_on=args.stand_on,
+        rules=VARIANTS[args.rules], seed=args.seed,
+    )
+    if args.json:
+        out.write(json.dumps(summary) + "\n")
+        return
+
+    out.write(f"{summary['paths']} bankrolls x {summary['rounds']} rounds "
+              f"({summary['hours']:g} hours), scheme {args.scheme}\n")
+    out.write(f"Risk of ruin: {100 * summary['risk_of_ruin']:.2f}%\n")
+    out.write(f"Hourly result: {summary['hourly_result']:+.3f} "
+              f"(std {summary['hourly_result_std']:.3f})\n")
+    out.write(f"Result per unit wagered: {summary['result_per_wagered']:+.4f}\n")
+    for key, label in (("max_drawdown_percentiles", "Max drawdown"),
+                       ("final_bankroll_percentiles", "Final bankroll")):
+        values = "  ".join(f"p{p} {v:.1f}" for p, v in summary[key].items())
+        out.write(f"{label}: {values}\n")
+
+
+def run_edge(args, out):
+    from house_edge import house_edge
+
+    result = house_edge(args.policy, args.decks, VARIANTS[args.rules], args.workers)
+    if args.json:
+        out.write(json.dumps(result) + "\n")
+        return
+
+    out.write(f"Policy {args.policy}, rules {args.rules}, {args.decks} deck(s), fresh shoe\n")
+    out.write(f"Expected net per round: {result['ev']:+.5f}  "
+              f"House edge: {100 * result['house_edge']:.3f}%\n")
+    width = max(map(len, OUTCOME_MESSAGES)) + 2
+    for message, p in zip(OUTCOME_MESSAGES, result["outcomes"]):
+        out.write(f"  {message:<{width}}{100 * p:.3f}%\n")
+
+
+def run_log_stats(args, out):
+    # NumPy is only needed (and imported) for reading logs
+    from round_log import open_log, summarize
+
+    summary = summarize(open_log(args.path))
+    if args.json:
+        out.write(json.dumps(summary) + "\n")
+        return
+
+    out.write(f"Rounds: {summary['rounds']}\n")
+    for key in ("player_win_rate", "push_rate", "player_bust_rate", "dealer_bust_rate"):
+        out.write(f"{key.replace('_', ' ').capitalize()}: {100 * summary[key]:.2f}%\n")
+
+
+def run_replay(args, out):
+    from round_log import open_log
+    from replay import replay_log
+
+    report = replay_log(open_log(args.path), args.decks, args.penetration, VARIANTS[args.rules])
+    if args.json:
+        out.write(json.dumps(report) + "\n")
+    else:
+        out.write(f"Rounds: {report['rounds']}  Sessions: {report['sessions']}  "
+                  f"Mismatches: {len(report['mismatches'])}\n")
+        for seed, number, problem in report["mismatches"]:
+            out.write(f"  seed {seed} round {number}: {problem}\n")
+    return 1 if report["mismatches"] else 0
+
+
+def main(argv=None, out=sys.stdout):
+    args = build_parser().parse_args(argv)
+    try:
+        if getattr(args, "rounds", 1) < 1:
+            raise ValueError("--rounds must be at least 1")
+        if args.command == "play":
+            run_play(args, out)
+        elif args.command == "simulate":
+            run_simulate(args, out)
+        elif args.command == "bankroll":
+            run_bankroll(args, out)
+        elif args.command == "edge":
+            run_edge(args, out)
+        elif args.command == "log-stats":
+            run_log_stats(args, out)
+        else:
+            return run_replay(args, out)
+    except BrokenPipeError:
+        # the reader stopped early (`play ... | head -1`): finish quietly, and
+        # point stdout at devnull so the interpreter's final flush can't fail too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (ValueError, OSError) as error:  # bad deck count / penetration, unreadable log
+        raise SystemExit(f"error: {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+import random
+from array import array
+
+from cards import CARD_NAMES, CARD_IS_ACE, CARD_HARD_VALUES, DECK_SIZE, new_deck
+from game_logic import (
+    Game21, OUTCOME_MESSAGES, hand_outcome, outcome_net, count_outcome, recommended_move,
+)
+from rules import DEFAULT_RULES
+from shoe import MIN_DECKS, MAX_DECKS, worst_case_cards
+
+# COMPACT SESSIONS
+# For hosting very many games at once (see server.py --compact). A Game21
+# carries an instance __dict__, its own Shoe object and bytearray, two Hand
+# objects with a list of card strings each, and an actions bytearray.
+# A CompactGame21 keeps only a few slots:
+# - its shoe is a slice of one big bytearray owned by a ShoeArena, found by
+#   index (sessions may share an index to deal from the same shoe);
+# - each hand is a single int: hard total, ace count and card count in the
+#   low bytes, then 6 bits per card code.
+# The round methods mirror Game21 (new_round, deal_initial_cards, player_hit,
+# player_total, play_dealer_turn, decide_winner, round_outcome, round_net ...),
+# which is all the server uses. Only the packed state is compact's own:
+# outcomes, payouts, the win / loss counters and the suggested move come
+# from game_logic's shared helpers (hand_outcome, outcome_net, count_outcome,
+# recommended_move) and the card methods are Game21's, so the rules are
+# written once. It is not a full stand-in: there is no actions record,
+# doubling, surrender, snapshot or round log, and the rules are always the
+# original ones (DEFAULT_RULES), so simulations and replays use Game21.
+# The hands are read-only tuples of card names.
+
+FIELD_BITS = 8
+FIELD_MASK = (1 << FIELD_BITS) - 1
+ACES_SHIFT = FIELD_BITS
+COUNT_SHIFT = 2 * FIELD_BITS
+CARDS_SHIFT = 3 * FIELD_BITS
+CARD_BITS = 6  # card codes are 0..51
+CARD_MASK = (1 << CARD_BITS) - 1
+
+ACE_FLAGS = bytes(CARD_IS_ACE)
+
+
+# PACKED HANDS
+
+def hand_append(hand, code):
+    """
+    Return the packed hand with one more card code.
+    """
+    count = hand >> COUNT_SHIFT & FIELD_MASK
+    return (hand + CARD_HARD_VALUES[code] + (ACE_FLAGS[code] << ACES_SHIFT) + (1 << COUNT_SHIFT)
+            + (code << (CARDS_SHIFT + CARD_BITS * count)))
+
+
+def hand_hard_total(hand):
+    return hand & FIELD_MASK
+
+
+def hand_is_soft(hand):
+    # same rule as Hand.is_soft
+    return hand >> ACES_SHIFT & FIELD_MASK > 0 and hand & FIELD_MASK <= 11
+
+
+def hand_total(hand):
+    if hand_is_soft(hand):
+        return (hand & FIELD_MASK) + 10
+    return hand & FIELD_MASK
+
+
+def hand_codes(hand):
+    count = hand >> COUNT_SHIFT & FIELD_MASK
+    cards = hand >> CARDS_SHIFT
+    return [cards >> (CARD_BITS * i) & CARD_MASK for i in range(count)]
+
+
+def hand_is_natural(hand):
+    # 21 with the first two cards, like Hand.is_blackjack
+    return hand >> COUNT_SHIFT & FIELD_MASK == 2 and hand_total(hand) == 21
+
+
+def hand_code(hand, index):
+    return hand >> (CARDS_SHIFT + CARD_BITS * index) & CARD_MASK
+
+
+# SHARED SHOES
+
+class ShoeArena:
+    """
+    Many shoes of the same size in one bytearray, addressed by index.
+
+    Each shoe is `shoe_size` bytes of card codes with its deal position in a
+    2-byte array. All shoes share one random number generator, so a session
+    costs a few dozen bytes of shoe instead of a Shoe object and a bytearray.
+    Released indexes are handed out again by add_shoe().
+    """
+
+    def __init__(self, num_decks=1, penetration=0.75, seed=None, rng=None):
+        if not MIN_DECKS <= num_decks <= MAX_DECKS:
+            raise ValueError(f"num_decks must be between {MIN_DECKS} and {MAX_DECKS}")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be greater than 0 and at most 1")
+
+        self.num_decks = num_decks
+        self.penetration = penetration
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random
+        self.rng = rng
+
+        self.shoe_size = DECK_SIZE * num_decks
+        self.cut_card = int(self.shoe_size * penetration)
+        # most cards one round (player and dealer) can take, as Game21.reserve
+        self.reserve = worst_case_cards(num_decks, 2)
+        self.cards = bytearray()
+        self.positions = array("H")
+        self.free = []
+
+    def __len__(self):
+        # shoes in use
+        return len(self.positions) - len(self.free)
+
+    def add_shoe(self):
+        """
+        Fill a shoe slot with a freshly shuffled shoe and return its index.
+        """
+        if self.free:
+            index = self.free.pop()
+            start = index * self.shoe_size
+            self.cards[start:start + self.shoe_size] = new_deck() * self.num_decks
+        else:
+            index = len(self.positions)
+            self.cards += new_deck() * self.num_decks
+            self.positions.append(0)
+        self.shuffle(index)
+        return index
+
+    def release(self, index):
+        # the slot is reused by the next add_shoe()
+        self.free.append(index)
+
+    def shuffle(self, index):
+        start = index * self.shoe_size
+        shoe = self.cards[start:start + self.shoe_size]
+        self.rng.shuffle(shoe)
+        self.cards[start:start + self.shoe_size] = shoe
+        self.positions[index] = 0
+
+    def needs_shuffle(self, index):
+        return self.positions[index] >= self.cut_card
+
+    def cards_remaining(self, index):
+        return self.shoe_size - self.positions[index]
+
+    def draw(self, index):
+        """
+        Return the next card code from shoe `index`.
+        """
+        position = self.positions[index]
+        if position >= self.shoe_size:
+            # same as Shoe.draw: reshuffle instead of running dry
+            self.shuffle(index)
+            position = 0
+        self.positions[index] = position + 1
+        return self.cards[index * self.shoe_size + position]
+
+
+class CompactGame21:
+    """
+    Game21 with slot-based state: same methods and counters, a fraction
+    of the memory. Pass a shared ShoeArena to host many sessions; without
+    one the game gets a private arena built from the Game21 arguments.
+    """
+
+    __slots__ = (
+        "shoes", "shoe_index", "player", "dealer", "dealer_hidden_revealed",
+        "player_wins", "dealer_wins", "pushes", "rounds_played",
+    )
+
+    # shared by every session (a class attribute costs no per-session memory)
+    rules = DEFAULT_RULES
+
+    def __init__(self, num_decks=1, penetration=0.75, seed=None, rng=None,
+                 shoes=None, shoe_index=None):
+        if shoes is None:
+            shoes = ShoeArena(num_decks, penetration, seed, rng)
+        self.shoes = shoes
+        self.shoe_index = shoes.add_shoe() if shoe_index is None else shoe_index
+
+        self.player_wins = 0
+        self.dealer_wins = 0
+        self.pushes = 0
+        self.rounds_played = 0
+        self.new_round()
+
+    def close(self):
+        """
+        Give the shoe slot back to the arena (the session must not be used after).
+        """
+        self.shoes.release(self.shoe_index)
+
+    # ROUND MANAGEMENT AND SETUP
+
+    def new_round(self):
+        # same early reshuffle as Game21.new_round
+        shoes = self.shoes
+        if shoes.needs_shuffle(self.shoe_index) or shoes.cards_remaining(self.shoe_index) < shoes.reserve:
+            shoes.shuffle(self.shoe_index)
+        self.player = 0
+        self.dealer = 0
+        self.dealer_hidden_revealed = False
+
+    def deal_initial_cards(self):
+        # same draw order as Game21: two for the player, then two for the dealer
+        draw = self.shoes.draw
+        index = self.shoe_index
+        self.player = hand_append(hand_append(0, draw(index)), draw(index))
+        self.dealer = hand_append(hand_append(0, draw(index)), draw(index))
+
+    # DECK AND CARD DRAWING
+
+    create_deck = Game21.create_deck
+
+    def draw_card(self):
+        return CARD_NAMES[self.shoes.draw(self.shoe_index)]
+
+    @property
+    def deck_position(self):
+        return self.shoes.positions[self.shoe_index]
+
+    # HANDS
+    # Built on request for code that wants card lists (the server replies);
+    # the totals below read the packed ints directly. Tuples, because adding
+    # to a copy would not change the game - use player_hit().
+
+    @property
+    def player_hand(self):
+        return tuple(CARD_NAMES[code] for code in hand_codes(self.player))
+
+    @property
+    def dealer_hand(self):
+        return tuple(CARD_NAMES[code] for code in hand_codes(self.dealer))
+
+    # a card, or a list of cards - neither reads the game state
+    card_value = Game21.card_value
+    hand_total = Game21.hand_total
+
+    # PLAYER ACTIONS
+
+    def player_hit(self):
+        code = self.shoes.draw(self.shoe_index)
+        self.player = hand_append(self.player, code)
+        return CARD_NAMES[code]
+
+    def player_total(self):
+        return hand_total(self.player)
+
+    def recommended_action(self):
+        return recommended_move(self.shoes.num_decks, self.rules, hand_total(self.player),
+                                hand_is_soft(self.player), hand_code(self.dealer, 1))
+
+    # DEALER ACTIONS
+
+    def reveal_dealer_card(self):
+        self.dealer_hidden_revealed = True
+
+    def dealer_total(self):
+        return hand_total(self.dealer)
+
+    def play_dealer_turn(self):
+        # same table lookup as Game21 (hard total, holds an Ace)
+        hits = self.rules.dealer_hits
+        draw = self.shoes.draw
+        while hits[(self.dealer & FIELD_MASK) * 2 + (self.dealer >> ACES_SHIFT & FIELD_MASK > 0)]:
+            self.dealer = hand_append(self.dealer, draw(self.shoe_index))
+
+    # WINNER DETERMINATION
+
+    def decide_winner(self):
+        outcome = self.round_outcome()
+        count_outcome(self, outcome)
+        return OUTCOME_MESSAGES[outcome]
+
+    def round_outcome(self):
+        return hand_outcome(hand_total(self.player), hand_total(self.dealer), self.rules,
+                            hand_is_natural(self.player), hand_is_natural(self.dealer))
+
+    def round_net(self):
+        # no doubling here, so always one bet
+        return outcome_net(self.round_outcome(), self.rules, 1, hand_is_natural(self.player))
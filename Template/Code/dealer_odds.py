@@ -0,0 +1,152 @@
+from collections import OrderedDict
+
+from cards import CARD_NAMES, VALUE_OF, IS_ACE
+from rules import DEFAULT_RULES
+
+# EXACT DEALER OUTCOME PROBABILITIES
+# The dealer follows play_dealer_turn(): hit until the total (best total with
+# Game21.hand_total ace handling) is 17 or more, or whatever the RuleSet's
+# dealer hit table says (e.g. hit soft 17). Given the dealer's cards and
+# what is left in the shoe, this works out the exact chance of every final
+# total by trying every possible next card, weighted by how many are left.
+
+# The shoe composition is a tuple of 10 counts, one per value class:
+# index 0 = Aces, 1..8 = 2..9, 9 = all ten-valued cards (10, J, Q, K).
+VALUE_CLASSES = 10
+CLASS_HARD_VALUES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+# Order of the probabilities returned by DealerOdds.final_probabilities()
+FINAL_TOTALS = (17, 18, 19, 20, 21)
+BUST = "bust"
+OUTCOMES = FINAL_TOTALS + (BUST,)
+
+# card (text or code) -> value class
+VALUE_CLASS_OF = {}
+for _code, _name in enumerate(CARD_NAMES):
+    VALUE_CLASS_OF[_code] = VALUE_CLASS_OF[_name] = 0 if IS_ACE[_code] else VALUE_OF[_code] - 1
+del _code, _name
+
+
+def shoe_counts(num_decks=1):
+    """
+    Composition of a full shoe: 4 of each value class per deck, 16 ten-valued.
+    """
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+
+def counts_from_cards(cards):
+    """
+    Build a composition tuple from a sequence of cards (texts or codes).
+    """
+    counts = [0] * VALUE_CLASSES
+    for card in cards:
+        counts[VALUE_CLASS_OF[card]] += 1
+    return tuple(counts)
+
+
+def remove_card(counts, card):
+    """
+    Return the composition with one copy of `card` taken out.
+    """
+    value_class = VALUE_CLASS_OF[card]
+    if counts[value_class] == 0:
+        raise ValueError(f"no {CARD_NAMES[card] if isinstance(card, int) else card} left in the shoe")
+    counts = list(counts)
+    counts[value_class] -= 1
+    return tuple(counts)
+
+
+class DealerOdds:
+    """
+    Recursive dealer outcome calculator with a bounded memo cache.
+
+    Results are cached on (dealer hard total, soft flag, remaining counts),
+    where the hard total counts Aces as 1 and the soft flag records whether
+    the hand holds an Ace. The cache is a least-recently-used dict capped at
+    `max_cache_size` entries; hits and misses are counted for tuning.
+    Each instance works for one set of rules (rules.RuleSet).
+    """
+
+    def __init__(self, max_cache_size=200_000, rules=None):
+        self.rules = rules or DEFAULT_RULES
+        self.dealer_hits = self.rules.dealer_hits
+        self.max_cache_size = max_cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def distribution(self, upcard, counts):
+        """
+        Dealer final-total distribution for a single upcard.
+
+        `counts` is the remaining shoe composition with the upcard already
+        removed (the hidden card is still unknown, so it stays in the counts).
+        Returns a dict {17: p, 18: p, 19: p, 20: p, 21: p, "bust": p}.
+        """
+        value_class = VALUE_CLASS_OF[upcard]
+        probabilities = self.final_probabilities(
+            CLASS_HARD_VALUES[value_class], value_class == 0, tuple(counts)
+        )
+        return dict(zip(OUTCOMES, probabilities))
+
+    def final_probabilities(self, hard_total, soft, counts):
+        """
+        Probabilities of finishing on 17..21 and of busting, as a tuple
+        in OUTCOMES order, for a dealer hand that still has to draw.
+        """
+        key = (hard_total, soft, counts)
+        cache = self._cache
+        result = cache.get(key)
+        if result is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._solve(hard_total, soft, counts)
+
+        cache[key] = result
+        if len(cache) > self.max_cache_size:
+            cache.popitem(last=False)  # drop the least recently used entry
+        return result
+
+    def _solve(self, hard_total, soft, counts):
+        remaining = sum(counts)
+        if remaining == 0:
+            raise ValueError("no cards left in the shoe")
+
+        hits = self.dealer_hits
+        result = [0.0] * len(OUTCOMES)
+        for value_class, count in enumerate(counts):
+            if count == 0:
+                continue
+            p = count / remaining
+
+            new_hard = hard_total + CLASS_HARD_VALUES[value_class]
+            new_soft = soft or value_class == 0
+            best = new_hard + 10 if new_soft and new_hard <= 11 else new_hard
+
+            if new_hard > 21:
+                result[-1] += p
+            elif not hits[new_hard * 2 + new_soft]:
+                result[best - 17] += p  # dealer stands (always on 17 or more)
+            else:
+                # dealer must hit again with one fewer card of this class
+                next_counts = counts[:value_class] + (count - 1,) + counts[value_class + 1:]
+                for i, sub_p in enumerate(self.final_probabilities(new_hard, new_soft, next_counts)):
+                    result[i] += p * sub_p
+
+        return tuple(result)
+
+    def cache_info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "max_size": self.max_cache_size,
+        }
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
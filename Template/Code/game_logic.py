@@ -1,11 +1,68 @@
 import random
 
+from cards import CARD_NAMES, CARD_CODES, DECK_SIZE, VALUE_OF, IS_ACE
+from dealer_odds import VALUE_CLASS_OF
+from hand import Hand
+from shoe import Shoe, HI_LO, worst_case_cards
+from rules import DEFAULT_RULES, RuleSet
+import strategy
+
+# Outcome codes for a finished round. decide_winner() returns the matching
+# message, headless code (simulations, batch engine) can work with the codes.
+PLAYER_BUST = 0
+DEALER_BUST = 1
+PLAYER_WIN = 2
+DEALER_WIN = 3
+PUSH = 4
+SURRENDER = 5
+
+OUTCOME_MESSAGES = (
+    "Player busts. Dealer wins!",
+    "Dealer busts. Player wins!",
+    "Player wins!",
+    "Dealer wins!",
+    "Push (tie).",
+    "Player surrenders. Half the bet is lost.",
+)
+
+# net result of one round in bets, by outcome code (before doubling and
+# blackjack bonus, see Game21.round_net)
+OUTCOME_NET = (-1.0, 1.0, 1.0, -1.0, 0.0, -0.5)
+
+# Player actions as recorded in Game21.actions (and the round log)
+HIT_ACTION = b"H"
+STAND_ACTION = b"S"
+DOUBLE_ACTION = b"D"
+SURRENDER_ACTION = b"R"
+
+
 class Game21:
-    def __init__(self):
+    def __init__(self, num_decks=1, penetration=0.75, seed=None, rng=None, round_log=None,
+                 rules=None, shoe_source=None):
+        # table rules (rules.RuleSet); the defaults are the original game
+        self.rules = rules or DEFAULT_RULES
+
         # Start immediately with a fresh round
         self.player_wins = 0  # simple stats tracker
         self.dealer_wins = 0
         self.pushes = 0
+        self.rounds_played = 0
+
+        # optional round_log.RoundLogWriter; every decided round is appended to it
+        self.round_log = round_log
+
+        # Shuffling uses its own random.Random when a seed is given, so games
+        # can be reproduced; otherwise the global random module is used.
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self.seed = seed
+
+        # The shoe is built and shuffled once; rounds deal from it until
+        # the cut card (penetration = fraction of the shoe dealt) is reached.
+        # A shoe_source (shoe_factory.ShoeFactory) hands over pre-shuffled shoes.
+        self.shoe = Shoe(num_decks, penetration, rng, shoe_source)
+        # most cards a round (player and dealer) can take, see new_round
+        self.reserve = worst_case_cards(num_decks, 2)
         self.new_round()
 
     # ROUND MANAGEMENT AND SETUP
@@ -13,31 +70,80 @@ class Game21:
         """
         Prepares for a new round
         Suggested process:
-        - Create and shuffle a new deck
-        - Reset card pointer
+        - Reshuffle the shoe if the cut card has been reached
         - Empty both hands
         - Reset whether the dealer's hidden card has been revealed
         """
-        self.deck = self.create_deck()
-        random.shuffle(self.deck)
-
-        # Instead of removing cards from the deck,
-        # we keep an index of the "next card" to deal.
-        self.deck_position = 0
+        # Instead of rebuilding the deck every round, keep dealing from
+        # the shoe position and only reshuffle at the cut card - or earlier
+        # when the cards left might not last the round (Shoe.draw would
+        # then reshuffle cards that are still in the hands).
+        if self.shoe.needs_shuffle or self.shoe.cards_remaining < self.reserve:
+            self.shoe.shuffle()
 
         # Hands start empty; cards will be dealt after UI calls deal_initial_cards()
-        self.player_hand = []
-        self.dealer_hand = []
+        self.player_hand = Hand()
+        self.dealer_hand = Hand()
+        self.actions = bytearray()
 
         # The first dealer card starts hidden until Stand is pressed
         self.dealer_hidden_revealed = False
 
+    # SNAPSHOT / RESTORE
+
+    def snapshot(self):
+        """
+        Return the full game state as plain data (JSON-friendly):
+        shoe order, deck position, RNG state, hands and counters.
+        """
+        return {
+            "seed": self.seed,
+            "rules": self.rules.to_dict(),
+            "shoe": self.shoe.snapshot(),
+            "player_hand": list(self.player_hand),
+            "dealer_hand": list(self.dealer_hand),
+            "actions": self.actions.decode(),
+            "dealer_hidden_revealed": self.dealer_hidden_revealed,
+            "player_wins": self.player_wins,
+            "dealer_wins": self.dealer_wins,
+            "pushes": self.pushes,
+            "rounds_played": self.rounds_played,
+        }
+
+    def restore(self, state):
+        """
+        Continue from a snapshot() - later rounds deal exactly as they
+        would have from the original game.
+        """
+        self.seed = state["seed"]
+        if "rules" in state:
+            self.rules = RuleSet.from_dict(state["rules"])
+        self.shoe.restore(state["shoe"])
+        self.reserve = worst_case_cards(self.shoe.num_decks, 2)
+        self.player_hand = Hand(state["player_hand"])
+        self.dealer_hand = Hand(state["dealer_hand"])
+        self.actions = bytearray(state["actions"].encode())
+        self.dealer_hidden_revealed = state["dealer_hidden_revealed"]
+        self.player_wins = state["player_wins"]
+        self.dealer_wins = state["dealer_wins"]
+        self.pushes = state["pushes"]
+        self.rounds_played = state["rounds_played"]
+
+    @classmethod
+    def from_snapshot(cls, state, round_log=None):
+        shoe = state["shoe"]
+        # throwaway rng so building the game doesn't touch the global random module
+        game = cls(shoe["num_decks"], shoe["penetration"], rng=random.Random(0),
+                   round_log=round_log, rules=RuleSet.from_dict(state.get("rules", {})))
+        game.restore(state)
+        return game
+
     def deal_initial_cards(self):
         """
         Deal two cards each to player and dealer.
         """
-        self.player_hand = [self.draw_card(), self.draw_card()]
-        self.dealer_hand = [self.draw_card(), self.draw_card()]
+        self.player_hand = Hand([self.draw_card(), self.draw_card()])
+        self.dealer_hand = Hand([self.draw_card(), self.draw_card()])
 
     # DECK AND CARD DRAWING
 
@@ -53,35 +159,87 @@ class Game21:
         suits = ["♠", "♥", "♦", "♣"]
         return [f"{rank}{suit}" for rank in ranks for suit in suits]
 
+    @property
+    def deck(self):
+        # the shoe's card codes (read-only view for older code)
+        return self.shoe.cards
+
+    @property
+    def deck_position(self):
+        # index of the next card to deal
+        return self.shoe.position
+
     def draw_card(self):
         """
-        Return the next card in the shuffled deck.
+        Return the next card in the shoe.
+        The shoe holds card codes; the card is returned as text for the UI.
         """
-        card = self.deck[self.deck_position]
-        self.deck_position += 1
-        return card
+        return CARD_NAMES[self.shoe.draw()]
+
+    # SHOE COMPOSITION
+    # Read straight from the shoe's counters (kept up to date on every draw),
+    # as the player sees it: the dealer's face-down card counts as unseen
+    # until it is revealed.
+
+    def _hidden_card(self):
+        # code of the dealer's face-down card, or None if none is hidden
+        if self.dealer_hidden_revealed or not self.dealer_hand:
+            return None
+        return CARD_CODES.get(self.dealer_hand[0], self.dealer_hand[0])
+
+    @property
+    def cards_remaining(self):
+        # cards the player has not seen (shoe plus the hidden card)
+        return self.shoe.cards_remaining + (self._hidden_card() is not None)
+
+    @property
+    def running_count(self):
+        """
+        Hi-Lo running count of the cards the player has seen since the shuffle.
+        """
+        hidden = self._hidden_card()
+        if hidden is None:
+            return self.shoe.running_count
+        return self.shoe.running_count - HI_LO[hidden]
+
+    @property
+    def true_count(self):
+        remaining = self.cards_remaining
+        return self.running_count * DECK_SIZE / remaining if remaining else 0.0
+
+    def unseen_value_counts(self):
+        """
+        Unseen cards per value class (Aces, 2..9, tens), ready for dealer_odds.
+        """
+        counts = self.shoe.value_counts()
+        hidden = self._hidden_card()
+        if hidden is None:
+            return counts
+        value_class = VALUE_CLASS_OF[hidden]
+        return counts[:value_class] + (counts[value_class] + 1,) + counts[value_class + 1:]
+
+    def probability_ten(self):
+        """
+        Chance that the next card the player sees is ten-valued.
+        """
+        remaining = self.cards_remaining
+        return self.unseen_value_counts()[9] / remaining if remaining else 0.0
 
     # HAND VALUES + ACE HANDLING
 
     def card_value(self, card):
         """
-        Convert a card string into its numeric value.
+        Convert a card into its numeric value.
 
         Rules:
         - Number cards = their number (2–10)
         - J, Q, K = 10
         - A is normally 11, may later count as 1 if needed
-        """
-        rank = card[:-1]  # everything except the suit symbol
 
-        if rank in ["J", "Q", "K"]:
-            return 10
-
-        if rank == "A":
-            return 11  # Initially treat Ace as 11
-
-        # Otherwise it's a number from 2 to 10
-        return int(rank)
+        Accepts the card text ('10♥') or its integer code (see cards.py);
+        the value comes from a precomputed table instead of parsing the text.
+        """
+        return VALUE_OF[card]
 
     def hand_total(self, hand):
         """
@@ -97,11 +255,8 @@ class Game21:
         aces = 0
 
         for card in hand:
-            value = self.card_value(card)
-            total += value
-            rank = card[:-1]
-            if rank == "A":
-                aces += 1
+            total += VALUE_OF[card]
+            aces += IS_ACE[card]
 
         # Adjust Aces from 11 to 1 as needed to avoid busting
         while total > 21 and aces > 0:
@@ -115,11 +270,54 @@ class Game21:
         # TODO: Add one card to the player's hand and return it, so the UI can display the card. Remove pass when complete.
         card = self.draw_card()
         self.player_hand.append(card)
+        self.actions += HIT_ACTION
         return card
 
     def player_total(self):
         # TODO: Return the player's total. Remove pass when complete.
-        return self.hand_total(self.player_hand)
+        # the Hand keeps its total up to date, so this does not rescan the cards
+        return self.player_hand.total
+
+    def can_double(self):
+        # only as the first decision, with the two dealt cards
+        return self.rules.allow_double and len(self.player_hand) == 2 and not self.actions
+
+    def can_surrender(self):
+        return self.rules.allow_surrender and len(self.player_hand) == 2 and not self.actions
+
+    def player_double(self):
+        """
+        Double the bet and take exactly one more card (return it for the UI).
+        The player's turn is over afterwards.
+        """
+        if not self.can_double():
+            raise ValueError("doubling is only allowed on the first two cards")
+        card = self.draw_card()
+        self.player_hand.append(card)
+        self.actions += DOUBLE_ACTION
+        return card
+
+    def player_surrender(self):
+        # give up the hand for half the bet; the dealer does not play
+        if not self.can_surrender():
+            raise ValueError("surrender is only allowed on the first two cards")
+        self.actions += SURRENDER_ACTION
+
+    @property
+    def bet(self):
+        # bets riding on the round (2 after a double)
+        return 2 if DOUBLE_ACTION[0] in self.actions else 1
+
+    def recommended_action(self):
+        """
+        Return "hit" or "stand" for the player's current hand against the
+        dealer's visible card (the second one; the first stays hidden), or
+        "double" / "surrender" when the rules allow it now and it is better.
+        Uses the precomputed strategy table, so each call is a single lookup.
+        """
+        return recommended_move(self.shoe.num_decks, self.rules, self.player_hand.total,
+                                self.player_hand.is_soft, self.dealer_hand[1],
+                                self.can_double(), self.can_surrender())
 
     # DEALER ACTIONS
     def reveal_dealer_card(self):
@@ -128,13 +326,18 @@ class Game21:
 
     def dealer_total(self):
         # TODO: Return the dealer's total. Remove pass when complete.
-        return self.hand_total(self.dealer_hand)
+        return self.dealer_hand.total
 
     def play_dealer_turn(self):
         # TODO: Dealer must hit until their total is 17 or more, then stand.  Remove pass when complete.
-        # Dealer draws until total >= 17
-        while self.dealer_total() < 17:
-            self.dealer_hand.append(self.draw_card())
+        # Dealer draws until total >= 17 (or as the rules say, e.g. hit soft 17)
+        # (the dealer only plays once the player has stood)
+        self.actions += STAND_ACTION
+        # one table lookup per card: hard total and whether an Ace is held
+        hits = self.rules.dealer_hits
+        hand = self.dealer_hand
+        while hits[hand.hard_total * 2 + (hand.aces > 0)]:
+            hand.append(self.draw_card())
 
     # WINNER DETERMINATION
 
@@ -148,26 +351,92 @@ class Game21:
         - "Dealer wins!"
         - "Push (tie)."
         """
-        player_total = self.player_total()
-        dealer_total = self.dealer_total()
-
-        # Player busts
-        if player_total > 21:
-            self.dealer_wins += 1
-            return "Player busts. Dealer wins!"
-
-        # Dealer busts
-        if dealer_total > 21:
-            self.player_wins += 1
-            return "Dealer busts. Player wins!"
-
-        # Neither busts – compare totals
-        if player_total > dealer_total:
-            self.player_wins += 1
-            return "Player wins!"
-        elif dealer_total > player_total:
-            self.dealer_wins += 1
-            return "Dealer wins!"
-        else:
-            self.pushes += 1
-            return "Push (tie)."
+        outcome = self.round_outcome()
+        count_outcome(self, outcome)
+        if self.round_log is not None:
+            self.round_log.write_round(self, self.rounds_played, outcome)
+        return OUTCOME_MESSAGES[outcome]
+
+    def round_outcome(self):
+        """
+        Return the outcome code of the current hands without touching the stats.
+        """
+        return hand_outcome(self.player_total(), self.dealer_total(), self.rules,
+                            self.player_hand.is_blackjack, self.dealer_hand.is_blackjack,
+                            self.actions.endswith(SURRENDER_ACTION))
+
+    def round_net(self):
+        """
+        Bets won (+) or lost (-) on the current round: doubled bets count
+        twice and a natural pays the rules' blackjack payout.
+        """
+        return outcome_net(self.round_outcome(), self.rules, self.bet, self.player_hand.is_blackjack)
+
+
+def outcome_of(player_total, dealer_total):
+    """
+    Outcome code for two final totals.
+    """
+    # Player busts
+    if player_total > 21:
+        return PLAYER_BUST
+
+    # Dealer busts
+    if dealer_total > 21:
+        return DEALER_BUST
+
+    # Neither busts – compare totals
+    if player_total > dealer_total:
+        return PLAYER_WIN
+    elif dealer_total > player_total:
+        return DEALER_WIN
+    else:
+        return PUSH
+
+
+# SHARED ROUND RULES
+# Game21, compact.CompactGame21 and table.Table keep their hands differently
+# but settle a round the same way; these helpers are the one copy of that.
+
+def hand_outcome(player_total, dealer_total, rules=DEFAULT_RULES, player_natural=False,
+                 dealer_natural=False, surrendered=False):
+    """
+    Outcome code of a finished hand: a surrender, a natural paid by the
+    rules' blackjack bonus, or else the totals compared (outcome_of).
+    """
+    if surrendered:
+        return SURRENDER
+    if rules.blackjack_payout and player_natural and not dealer_natural:
+        # a natural beats any other dealer hand, even a 21
+        return PLAYER_WIN
+    return outcome_of(player_total, dealer_total)
+
+
+def outcome_net(outcome, rules=DEFAULT_RULES, bet=1, player_natural=False):
+    """
+    Bets won (+) or lost (-) for an outcome code: `bet` is 2 after a double,
+    and a winning natural pays the rules' blackjack payout.
+    """
+    if outcome == PLAYER_WIN and player_natural and rules.blackjack_payout:
+        return rules.blackjack_payout
+    return OUTCOME_NET[outcome] * bet
+
+
+def count_outcome(game, outcome):
+    # the player_wins / dealer_wins / pushes / rounds_played counters
+    if outcome in (DEALER_BUST, PLAYER_WIN):
+        game.player_wins += 1
+    elif outcome in (PLAYER_BUST, DEALER_WIN, SURRENDER):
+        game.dealer_wins += 1
+    else:
+        game.pushes += 1
+    game.rounds_played += 1
+
+
+def recommended_move(num_decks, rules, total, soft, upcard, can_double=False, can_surrender=False):
+    """
+    The strategy table's move for a hand against the dealer's upcard
+    (card text or code).
+    """
+    table = strategy.get_table(num_decks, rules=rules)
+    return table.action(total, soft, VALUE_OF[upcard], can_double, can_surrender)
@@ -0,0 +1,78 @@
+from cards import VALUE_OF, IS_ACE
+
+
+class Hand:
+    """
+    A hand of cards that keeps its total up to date as cards are added.
+
+    Aces are counted as 1 in `hard_total`; one of them is worth 11 instead
+    when that does not bust the hand (same result as Game21.hand_total).
+    All totals are worked out as cards are appended, so reading them never
+    rescans the hand.
+
+    Iteration, len() and indexing work like a list, so the UI can keep
+    looping over the cards.
+    """
+
+    __slots__ = ("cards", "hard_total", "aces")
+
+    def __init__(self, cards=()):
+        self.cards = []
+        self.hard_total = 0
+        self.aces = 0
+        self.extend(cards)
+
+    def append(self, card):
+        # card can be the text ('A♠') or the integer code from cards.py
+        self.cards.append(card)
+        if IS_ACE[card]:
+            self.aces += 1
+            self.hard_total += 1
+        else:
+            self.hard_total += VALUE_OF[card]
+
+    def extend(self, cards):
+        # several cards at once (e.g. a slice of the shoe)
+        self.cards.extend(cards)
+        for card in cards:
+            if IS_ACE[card]:
+                self.aces += 1
+                self.hard_total += 1
+            else:
+                self.hard_total += VALUE_OF[card]
+
+    # HAND QUERIES
+
+    @property
+    def is_soft(self):
+        # an Ace is currently being counted as 11
+        return self.aces > 0 and self.hard_total <= 11
+
+    @property
+    def total(self):
+        if self.is_soft:
+            return self.hard_total + 10
+        return self.hard_total
+
+    @property
+    def is_bust(self):
+        return self.hard_total > 21
+
+    @property
+    def is_blackjack(self):
+        # 21 with the first two cards
+        return len(self.cards) == 2 and self.total == 21
+
+    # LIST-STYLE ACCESS
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    def __repr__(self):
+        return f"Hand({self.cards!r})"
@@ -0,0 +1,309 @@
+import json
+import os
+import tempfile
+
+from dealer_odds import DealerOdds, CLASS_HARD_VALUES, FINAL_TOTALS, VALUE_CLASSES, shoe_counts
+from game_logic import (
+    OUTCOME_NET, PLAYER_BUST, DEALER_BUST, PLAYER_WIN, SURRENDER, outcome_of,
+)
+from rules import DEFAULT_RULES
+from shoe import MIN_DECKS, MAX_DECKS
+import strategy
+
+# EXACT HOUSE EDGE
+# The expected result of one Game21 round off a freshly shuffled shoe, played
+# the way simulation.play_round plays it, worked out exactly instead of
+# sampled: every initial deal (player card, player card, dealer hole card,
+# dealer upcard - Game21's dealing order) and every card the player then
+# draws is enumerated with its exact probability given the cards still in
+# the shoe. When the player stands, dealer_odds gives the dealer's exact
+# final-total distribution for what is left.
+#
+# The work is split by the player's two first cards (55 unordered pairs,
+# the two orders of a pair are equally likely), so it fans out over worker
+# processes. Inside a pair, player subtrees reached by drawing the same cards
+# in a different order are memoized, and each process keeps one DealerOdds
+# cache per rule set across the pairs it handles.
+#
+# Finished results are stored in a JSON file keyed by rules, policy and
+# decks, so asking again is a file lookup. The file carries CACHE_VERSION
+# (a file from another version is ignored and rewritten) and is replaced in
+# one step, so a crash or a second run mid-write never leaves it half written.
+
+CACHE_PATH = os.path.join(strategy.CACHE_DIR, "house_edge.json")
+CACHE_VERSION = 1  # bump when the enumeration or the result layout changes
+
+
+# POLICIES
+# The simulation policies (simulation.POLICIES) look at a live game; here
+# the same decisions are written against (hard total, best total, soft,
+# dealer upcard value). "basic" also doubles or surrenders on the first
+# decision when the rules allow it (see _first_move), like play_round.
+
+def _stand_on_17(hard, total, soft, upcard_value, num_decks, rules):
+    return total < 17
+
+
+def _never_bust(hard, total, soft, upcard_value, num_decks, rules):
+    return hard <= 11
+
+
+def _basic_strategy(hard, total, soft, upcard_value, num_decks, rules):
+    return strategy.get_table(num_decks, rules=rules).action(total, soft, upcard_value) == strategy.HIT
+
+
+POLICIES = {
+    "stand17": _stand_on_17,
+    "never-bust": _never_bust,
+    "basic": _basic_strategy,
+}
+
+
+def _first_move(policy, total, soft, upcard_value, num_decks, rules):
+    # strategy.DOUBLE / strategy.SURRENDER when the policy takes that move
+    # on its first two cards, otherwise None
+    if policy != "basic" or not (rules.allow_double or rules.allow_surrender):
+        return None
+    move = strategy.get_table(num_decks, rules=rules).action(
+        total, soft, upcard_value, rules.allow_double, rules.allow_surrender)
+    return move if move in (strategy.DOUBLE, strategy.SURRENDER) else None
+
+
+# ENUMERATION
+
+_dealer_odds = {}  # RuleSet -> DealerOdds, one per worker process
+
+
+def _take(counts, value_class):
+    return counts[:value_class] + (counts[value_class] - 1,) + counts[value_class + 1:]
+
+
+def _best_total(hard, ace):
+    return hard + 10 if ace and hard <= 11 else hard
+
+
+def _upcard_value(value_class):
+    # value class -> card value as Game21 sees it (Ace = 11)
+    return 11 if value_class == 0 else CLASS_HARD_VALUES[value_class]
+
+
+def pair_result(first, second, policy="stand17", num_decks=1, rules=None):
+    """
+    Exact contribution of the player starting with value classes `first`
+    and `second` (in that order): (expected net, outcome probabilities by
+    outcome code), both already weighted by the chance of that start.
+    """
+    rules = rules or DEFAULT_RULES
+    decide = POLICIES[policy]
+    dealer_odds = _dealer_odds.get(rules)
+    if dealer_odds is None:
+        dealer_odds = _dealer_odds[rules] = DealerOdds(rules=rules)
+    hits = rules.dealer_hits
+    payout = rules.blackjack_payout
+
+    net = 0.0
+    outcomes = [0.0] * len(OUTCOME_NET)
+
+    counts = shoe_counts(num_decks)
+    remaining = sum(counts)
+    p_start = counts[first] / remaining
+    counts = _take(counts, first)
+    p_start *= counts[second] / (remaining - 1)
+    counts = _take(counts, second)
+    remaining -= 2
+
+    hard = CLASS_HARD_VALUES[first] + CLASS_HARD_VALUES[second]
+    ace = first == 0 or second == 0
+    natural = _best_total(hard, ace) == 21
+
+    for hole in range(VALUE_CLASSES):
+        if not counts[hole]:
+            continue
+        p_hole = counts[hole] / remaining
+        after_hole = _take(counts, hole)
+        for up in range(VALUE_CLASSES):
+            if not after_hole[up]:
+                continue
+            p_deal = p_start * p_hole * after_hole[up] / (remaining - 1)
+            shoe = _take(after_hole, up)
+
+            dealer_hard = CLASS_HARD_VALUES[hole] + CLASS_HARD_VALUES[up]
+            dealer_ace = hole == 0 or up == 0
+            if natural and payout and _best_total(dealer_hard, dealer_ace) != 21:
+                # a natural beats any other dealer hand and pays the bonus
+                net += p_deal * payout
+                outcomes[PLAYER_WIN] += p_deal
+                continue
+
+            upcard_value = _upcard_value(up)
+            total = _best_total(hard, ace)
+            move = _first_move(policy, total, ace and hard <= 11, upcard_value, num_decks, rules)
+            if move == strategy.SURRENDER:
+                # half the bet is lost, the dealer does not play
+                net += p_deal * OUTCOME_NET[SURRENDER]
+                outcomes[SURRENDER] += p_deal
+                continue
+            memo = {}
+
+            def dealer_finals(shoe):
+                # final-total distribution (17..21, bust) of the dealer's hand
+                if hits[dealer_hard * 2 + dealer_ace]:
+                    return dealer_odds.final_probabilities(dealer_hard, dealer_ace, shoe)
+                finals = [0.0] * (len(FINAL_TOTALS) + 1)
+                finals[_best_total(dealer_hard, dealer_ace) - 17] = 1.0
+                return finals
+
+            def stand(total, shoe):
+                # outcome probabilities once the player stands on `total`
+                result = [0.0] * len(OUTCOME_NET)
+                finals = dealer_finals(shoe)
+                result[DEALER_BUST] = finals[-1]
+                for final, p in zip(FINAL_TOTALS, finals):
+                    result[outcome_of(total, final)] += p
+                return result
+
+            def draw(hard, ace, shoe, then):
+                # every next card, weighted; `then` plays on from a card that doesn't bust
+                result = [0.0] * len(OUTCOME_NET)
+                left = sum(shoe)
+                for value_class, count in enumerate(shoe):
+                    if not count:
+                        continue
+                    p = count / left
+                    new_hard = hard + CLASS_HARD_VALUES[value_class]
+                    if new_hard > 21:
+                        result[PLAYER_BUST] += p
+                        continue
+                    sub = then(new_hard, ace or value_class == 0, _take(shoe, value_class))
+                    for code, sub_p in enumerate(sub):
+                        result[code] += p * sub_p
+                return result
+
+            def play(hard, ace, shoe):
+                # outcome probabilities from here on, by outcome code
+                key = (hard, ace, shoe)
+                result = memo.get(key)
+                if result is not None:
+                    return result
+
+                total = _best_total(hard, ace)
+                if total < 21 and decide(hard, total, ace and hard <= 11, upcard_value,
+                                         num_decks, rules):
+                    result = draw(hard, ace, shoe, play)
+                else:
+                    result = stand(total, shoe)
+                memo[key] = result
+                return result
+
+            if move == strategy.DOUBLE:
+                # one more card, then stand, for two bets
+                bet = 2
+                result = draw(hard, ace, shoe,
+                              lambda hard, ace, shoe: stand(_best_total(hard, ace), shoe))
+            else:
+                bet = 1
+                result = play(hard, ace, shoe)
+            for code, p in enumerate(result):
+                outcomes[code] += p_deal * p
+                net += p_deal * p * OUTCOME_NET[code] * bet
+
+    return net, outcomes
+
+
+def _pair_result_args(args):
+    # ProcessPoolExecutor.map passes a single argument
+    first, second, policy, num_decks, rules = args
+    net, outcomes = pair_result(first, second, policy, num_decks, rules)
+    if first != second:
+        # (second, first) is just as likely and plays out the same way
+        net *= 2
+        outcomes = [2 * p for p in outcomes]
+    return net, outcomes
+
+
+def exact_result(policy="stand17", num_decks=1, rules=None, workers=1):
+    """
+    Enumerate every round and return {"ev", "house_edge", "outcomes"}:
+    the expected net result per bet, the house edge (-ev) and the chance
+    of each outcome code. Pairs are shared across `workers` processes.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, choose from {', '.join(POLICIES)}")
+    if not MIN_DECKS <= num_decks <= MAX_DECKS:
+        raise ValueError(f"num_decks must be between {MIN_DECKS} and {MAX_DECKS}")
+    rules = rules or DEFAULT_RULES
+
+    if policy == "basic":
+        # build (or load) the table once, not in every worker
+        strategy.get_table(num_decks, rules=rules)
+
+    pairs = [
+        (first, second, policy, num_decks, rules)
+        for first in range(VALUE_CLASSES)
+        for second in range(first, VALUE_CLASSES)
+    ]
+    if workers <= 1:
+        results = list(map(_pair_result_args, pairs))
+    else:
+        # imported here so single-process runs don't pay for it
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_pair_result_args, pairs))
+
+    ev = sum(net for net, _ in results)
+    outcomes = [sum(column) for column in zip(*(pair for _, pair in results))]
+    return {"ev": ev, "house_edge": -ev, "outcomes": outcomes}
+
+
+# CACHED ACCESS
+
+def cache_key(policy, num_decks, rules):
+    return json.dumps([policy, num_decks, (rules or DEFAULT_RULES).to_dict()], sort_keys=True)
+
+
+def _load_cache(path):
+    # cached results by cache_key, or {} for a missing, broken or outdated file
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("results", {})
+
+
+def _save_cache(path, cache):
+    # write a temporary file next to the cache, then swap it in
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "results": cache}, f, indent=1)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def house_edge(policy="stand17", num_decks=1, rules=None, workers=1, cache_path=CACHE_PATH):
+    """
+    Exact result for a rule set, policy and deck count (see exact_result),
+    read from the disk cache or enumerated and then cached.
+    """
+    key = cache_key(policy, num_decks, rules)
+    cache = _load_cache(cache_path)
+    if key in cache:
+        return cache[key]
+
+    result = exact_result(policy, num_decks, rules, workers)
+    # re-read so results saved meanwhile by another run are kept
+    cache = _load_cache(cache_path)
+    cache[key] = result
+    try:
+        _save_cache(cache_path, cache)
+    except OSError:
+        pass  # read-only install - just return the result
+    return result
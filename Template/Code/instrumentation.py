@@ -0,0 +1,153 @@
+import functools
+import inspect
+import json
+import os
+import time
+
+# OPT-IN TIMING COUNTERS
+# Counts calls and time spent in the Game21 methods and the MainWindow
+# handlers, to see whether a slow table is game logic, card label churn or
+# restyling. Nothing is wrapped unless instrumentation is turned on, so
+# normal runs call the original methods with no extra cost.
+#
+# Turn it on by setting GAME21_PROFILE=1 before starting main.py (a Debug
+# menu then shows the counters), or call enable() from other code.
+# Methods are wrapped on the class, so it must happen before a MainWindow is
+# created - Qt signals keep the method they were connected to.
+
+ENV_VAR = "GAME21_PROFILE"
+
+GAME_METHODS = (
+    "new_round", "deal_initial_cards", "draw_card", "card_value", "hand_total",
+    "player_hit", "player_total", "recommended_action", "reveal_dealer_card",
+    "dealer_total", "play_dealer_turn", "decide_winner", "round_outcome",
+)
+
+WINDOW_METHODS = (
+    "on_hit", "on_stand", "on_new_round", "new_round_setup", "update_dealer_cards",
+    "show_cards", "add_card", "set_card_face", "apply_ui_sizes", "set_status_style",
+)
+
+# name -> [calls, total seconds, own seconds (total minus instrumented callees)]
+_counters = {}
+# time spent in instrumented callees, one entry per active call
+_child_time = []
+_instrumented = set()
+
+
+def requested():
+    """
+    True when the GAME21_PROFILE environment variable asks for instrumentation.
+    """
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+def enabled():
+    return bool(_instrumented)
+
+
+def _max_positional(func):
+    # None if the function takes *args
+    code = func.__code__
+    if code.co_flags & inspect.CO_VARARGS:
+        return None
+    return code.co_argcount
+
+
+def _timed(name, func):
+    counter = _counters.setdefault(name, [0, 0.0, 0.0])
+    perf_counter = time.perf_counter
+    # Qt passes signal arguments (e.g. clicked's `checked`) to any slot that
+    # accepts them; the wrapper accepts everything, so drop what func doesn't take
+    max_positional = _max_positional(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if max_positional is not None:
+            args = args[:max_positional]
+        _child_time.append(0.0)
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            child = _child_time.pop()
+            counter[0] += 1
+            counter[1] += elapsed
+            counter[2] += elapsed - child
+            if _child_time:
+                _child_time[-1] += elapsed
+
+    return wrapper
+
+
+def instrument(cls, method_names):
+    """
+    Wrap the named methods of `cls` with call/time counters.
+    Counters are named "Class.method". Wrapping twice does nothing.
+    """
+    for method_name in method_names:
+        name = f"{cls.__name__}.{method_name}"
+        if name in _instrumented:
+            continue
+        setattr(cls, method_name, _timed(name, getattr(cls, method_name)))
+        _instrumented.add(name)
+
+
+def enable(window_class=None):
+    """
+    Instrument Game21 and, if given, the MainWindow class.
+    """
+    from game_logic import Game21
+
+    instrument(Game21, GAME_METHODS)
+    if window_class is not None:
+        instrument(window_class, WINDOW_METHODS)
+
+
+def reset():
+    # counters are zeroed in place - the wrappers keep references to them
+    for counter in _counters.values():
+        counter[:] = [0, 0.0, 0.0]
+
+
+# SNAPSHOT AND OUTPUT
+
+def snapshot():
+    """
+    Copy of the counters: {name: {"calls", "total_ms", "own_ms", "mean_us"}},
+    busiest (most total time) first. Methods never called are left out.
+    """
+    rows = sorted(_counters.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        name: {
+            "calls": calls,
+            "total_ms": total * 1e3,
+            "own_ms": own * 1e3,
+            "mean_us": total / calls * 1e6,
+        }
+        for name, (calls, total, own) in rows
+        if calls
+    }
+
+
+def format_table(counters=None):
+    """
+    Plain-text table of a snapshot (the current counters by default).
+    """
+    counters = snapshot() if counters is None else counters
+    if not counters:
+        return "No calls recorded."
+
+    width = max(len(name) for name in counters)
+    lines = [f"{'method':<{width}} {'calls':>9} {'total ms':>10} {'own ms':>10} {'mean us':>10}"]
+    for name, row in counters.items():
+        lines.append(
+            f"{name:<{width}} {row['calls']:>9} {row['total_ms']:>10.2f} "
+            f"{row['own_ms']:>10.2f} {row['mean_us']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def to_json(counters=None):
+    return json.dumps(snapshot() if counters is None else counters, indent=2)
@@ -1,13 +1,19 @@
-from PyQt6.QtGui import QIcon, QPixmap, QAction
+from PyQt6.QtGui import QIcon, QPixmap, QAction, QFontDatabase
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QLabel, QWidget,
     QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton,
-    QMessageBox, QDialog, QFormLayout, QSpinBox, QCheckBox, QDialogButtonBox
+    QMessageBox, QDialog, QFormLayout, QSpinBox, QCheckBox, QDialogButtonBox,
+    QPlainTextEdit, QFileDialog
 )
 from PyQt6.QtCore import Qt
 import sys
 # this project should use a modular approach - try to keep UI logic and game logic separate
 from game_logic import Game21
+import theme
+from card_atlas import CardAtlas
+from advisor import Advisor
+import instrumentation
+import strategy
 
 
 class MainWindow(QMainWindow):
@@ -24,99 +30,28 @@ class MainWindow(QMainWindow):
 
         self.game = Game21()
 
-        # set global styles
-        table_image_path = "./images/table_bg.jpg"
-
         # set stylesheet for the main window and its components
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: #0b3b24; /* fallback */
-            }}
-            #centralWidget {{
-                background-color: #0b3b24;
-                background-image: url("{table_image_path}");
-                background-repeat: no-repeat;
-                background-position: center;
-            }}
-            QGroupBox {{
-                border: 2px solid #1abc9c;
-                border-radius: 10px;
-                margin-top: 10px;
-                color: #ecf0f1;
-                font-weight: bold;
-                background-color: rgba(0,0,0,0.35);
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 14px;
-                padding: 0 6px;
-            }}
-            QLabel {{
-                color: #ecf0f1;
-                font-size: 13px;
-            }}
-            QLabel[card="true"] {{
-                /* card-like rectangle */
-                border: 2px solid #2c3e50;
-                border-radius: 12px;
-
-                /* keep text away from the edge */
-                padding: 6px 10px;
-
-                /* FIXED card size (prevents stretching) */
-                min-width: 90px;
-                max-width: 90px;
-                min-height: 130px;
-                max-height: 130px;            
-
-                background-color: #ffffff;
-                color: #000000;
-                font-size: 22px;
-                font-weight: bold;
-
-                margin-right: 8px;
-            }}
-            /* red text for hearts & diamonds, without losing the card shape */
-            QLabel[card="true"][red="true"] {{
-                color: #e74c3c;
-            }}
-            QPushButton {{
-                border-radius: 18px;
-                padding: 10px 28px;
-                font-weight: bold;
-                font-size: 15px;
-                color: #ffffff;
-            }}
-            QPushButton#hitButton {{
-                background-color: #27ae60;
-            }}
-            QPushButton#hitButton:hover:!disabled {{
-                background-color: #2ecc71;
-            }}
-            QPushButton#standButton {{
-                background-color: #c0392b;
-            }}
-            QPushButton#standButton:hover:!disabled {{
-                background-color: #e74c3c;
-            }}
-            QPushButton#newRoundButton {{
-                background-color: #2980b9;
-            }}
-            QPushButton#newRoundButton:hover:!disabled {{
-                background-color: #3498db;
-            }}
-            QPushButton:disabled {{
-                background-color: #555555;
-                color: #aaaaaa;
-            }}
-        """)
+        self.setStyleSheet(theme.WINDOW_STYLE)
 
         self.initUI()
         # set default sizes
         self.card_font_size = 22
-        self.status_font_size = 15
+        self.status_font_size = 18
         self.high_contrast = False
 
+        # card faces are pre-rendered pixmaps, redrawn only when card settings change
+        self.card_atlas = CardAtlas()
+
+        # status font size the current status stylesheet was picked for
+        # (None = not applied yet)
+        self.applied_status_size = None
+
+        # win / push / lose odds and suggested move, worked out off the GUI thread
+        self.advisor = Advisor(self)
+        self.advisor.result_ready.connect(self.show_advice)
+        # the strategy table is built in the advisor's worker, never here
+        self.advisor.warm(self.game.shoe.num_decks, self.game.rules)
+
         self.create_menu()
         self.apply_ui_sizes()
 
@@ -163,19 +98,24 @@ class MainWindow(QMainWindow):
         topRowLayout.addStretch(1)  # left spacer
 
         # TODO: Dealer Section with cards
-        dealerGroup = QGroupBox("Dealer")
+        self.dealerGroup = QGroupBox("Dealer")
         dealerLayout = QVBoxLayout()
         dealerLayout.setSpacing(8)
-        dealerGroup.setLayout(dealerLayout)
+        self.dealerGroup.setLayout(dealerLayout)
 
         self.dealerCardsLayout = QHBoxLayout()
         self.dealerCardsLayout.setSpacing(6)
         dealerLayout.addLayout(self.dealerCardsLayout)
 
+        # card labels currently shown, plus a pool of hidden ones to reuse
+        self.dealerCardLabels = []
+        self.playerCardLabels = []
+        self.spareCardLabels = []
+
         self.dealerTotalLabel = QLabel("Dealer total: ?")
         dealerLayout.addWidget(self.dealerTotalLabel)
 
-        topRowLayout.addWidget(dealerGroup, stretch=2)
+        topRowLayout.addWidget(self.dealerGroup, stretch=2)
 
         #  TODO: Feedback – stats panel on the right
         statsGroup = QGroupBox("Status")
@@ -211,16 +151,8 @@ class MainWindow(QMainWindow):
         # limit the width so it doesn't stretch across the whole window
         self.statusLabel.setMaximumWidth(720)
 
-        # smaller padding and font so it looks less tall
-        self.statusLabel.setStyleSheet("""
-            background-color: #145a32;
-            color: #f1c40f;
-            font-size: 14px;
-            font-weight: bold;
-            border-radius: 14px;
-            padding: 6px 10px;
-            border: 2px solid #f1c40f;
-        """)
+        # colours come from the status stylesheet (theme.py) via this property
+        self.statusLabel.setProperty("outcome", "welcome")
 
         # center the status label horizontally
         statusRow = QHBoxLayout()
@@ -230,10 +162,10 @@ class MainWindow(QMainWindow):
         mainLayout.addLayout(statusRow)
 
         # TODO: Player Section with cards
-        playerGroup = QGroupBox("Player")
+        self.playerGroup = QGroupBox("Player")
         playerLayout = QVBoxLayout()
         playerLayout.setSpacing(5)
-        playerGroup.setLayout(playerLayout)
+        self.playerGroup.setLayout(playerLayout)
 
         self.playerCardsLayout = QHBoxLayout()
         self.playerCardsLayout.setSpacing(6)
@@ -242,7 +174,12 @@ class MainWindow(QMainWindow):
         self.playerTotalLabel = QLabel("Player total: 0")
         playerLayout.addWidget(self.playerTotalLabel)
 
-        mainLayout.addWidget(playerGroup)
+        # live odds for the current hand (filled in by the advisor)
+        self.advisorLabel = QLabel("")
+        self.advisorLabel.setObjectName("advisorLabel")
+        playerLayout.addWidget(self.advisorLabel)
+
+        mainLayout.addWidget(self.playerGroup)
 
         #  TODO: Buttons for hit, stand, new round
         controlsLayout = QHBoxLayout()
@@ -302,12 +239,37 @@ class MainWindow(QMainWindow):
         new_game_action.triggered.connect(self.on_new_game)
         game_menu.addAction(new_game_action)
 
+        # Hint: suggested move from the precomputed strategy table
+        self.hint_action = QAction("Suggest Move", self)
+        self.hint_action.triggered.connect(self.show_hint)
+        game_menu.addAction(self.hint_action)
+
+        display_action = QAction("Display Settings...", self)
+        display_action.triggered.connect(self.show_display_settings)
+        game_menu.addAction(display_action)
+
         game_menu.addSeparator()
 
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.close)
         game_menu.addAction(exit_action)
 
+        # timing counters, only when instrumentation is switched on (GAME21_PROFILE=1)
+        if instrumentation.enabled():
+            debug_menu = menubar.addMenu("Debug")
+
+            counters_action = QAction("Timing Counters...", self)
+            counters_action.triggered.connect(self.show_counters)
+            debug_menu.addAction(counters_action)
+
+            save_counters_action = QAction("Save Counters as JSON...", self)
+            save_counters_action.triggered.connect(self.save_counters)
+            debug_menu.addAction(save_counters_action)
+
+            reset_counters_action = QAction("Reset Counters", self)
+            reset_counters_action.triggered.connect(instrumentation.reset)
+            debug_menu.addAction(reset_counters_action)
+
         help_menu = menubar.addMenu("Help")
         about_action = QAction("About / How to Play", self)
         about_action.triggered.connect(self.show_about)
@@ -322,12 +284,52 @@ class MainWindow(QMainWindow):
 
         self.update_score_labels()
 
+        # a new game also starts from a freshly shuffled shoe
+        self.game.shoe.shuffle()
         self.game.new_round()
         self.new_round_setup()
 
         self.statusLabel.setText("New game started - good luck!")
         self.set_status_style("neutral")
 
+    def show_hint(self):
+        # only meaningful while the player can still act
+        if not self.hitButton.isEnabled():
+            self.statusLabel.setText("Start a round to get a suggestion")
+            return
+        if strategy.loaded_table(self.game.shoe.num_decks, self.game.rules) is None:
+            # still being built in the advisor's worker - don't solve it here
+            self.advisor.warm(self.game.shoe.num_decks, self.game.rules)
+            self.statusLabel.setText("The strategy table is still being worked out - try again shortly")
+            return
+        action = self.game.recommended_action()
+        self.statusLabel.setText(f"Suggested move: {action.capitalize()}")
+
+    # DEBUG COUNTERS
+    def show_counters(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Timing Counters")
+        layout = QVBoxLayout(dialog)
+
+        text = QPlainTextEdit(instrumentation.format_table())
+        text.setReadOnly(True)
+        text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        text.setMinimumSize(640, 360)
+        layout.addWidget(text)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        dialog.exec()
+
+    def save_counters(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Timing Counters", "game21_counters.json", "JSON files (*.json)"
+        )
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(instrumentation.to_json())
+
     # ABOUT DIALOG
     def show_about(self):
         text = (
@@ -362,35 +364,67 @@ class MainWindow(QMainWindow):
         QMessageBox.information(self, "About Game of 21", text)
     # UI SIZE ADJUSTMENTS
     def apply_ui_sizes(self):
-        border_color = "#000000" if self.high_contrast else "#2c3e50"
-        border_width = "3px" if self.high_contrast else "2px"
-
-        # append a small rule override so we can adjust sizes without rewriting all CSS
-        self.setStyleSheet(self.styleSheet() + f"""
-                QLabel[card="true"] {{
-                    border: {border_width} solid {border_color};
-                    font-size: {self.card_font_size}px;
-                }}
-            """)
-
-        if hasattr(self, "statusLabel"):
-            self.statusLabel.setWordWrap(False)
-            self.statusLabel.setStyleSheet(self.statusLabel.styleSheet() + f"""
-                    font-size: {self.status_font_size}px;
-                    padding: 2px 10px;
-                """)
+        # Use the precompiled stylesheets and card pixmaps for the current
+        # settings instead of appending new rules; nothing is redone if a
+        # setting is unchanged.
+        if self.card_atlas.set_style(self.card_font_size, self.high_contrast):
+            # swap the new pixmaps onto the cards already on the table
+            for label in self.dealerCardLabels + self.playerCardLabels:
+                self.set_card_face(label, label.property("cardText"))
+
+        if self.status_font_size != self.applied_status_size:
+            self.statusLabel.setStyleSheet(theme.status_stylesheet(self.status_font_size))
+            self.applied_status_size = self.status_font_size
+
+    def show_display_settings(self):
+        # Small dialog to change card size, status size and contrast
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Display Settings")
+        form = QFormLayout(dialog)
+
+        card_size = QSpinBox()
+        card_size.setRange(14, 36)
+        card_size.setValue(self.card_font_size)
+        form.addRow("Card font size:", card_size)
+
+        status_size = QSpinBox()
+        status_size.setRange(10, 28)
+        status_size.setValue(self.status_font_size)
+        form.addRow("Status font size:", status_size)
+
+        contrast = QCheckBox("High contrast cards")
+        contrast.setChecked(self.high_contrast)
+        form.addRow(contrast)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            self.card_font_size = card_size.value()
+            self.status_font_size = status_size.value()
+            self.high_contrast = contrast.isChecked()
+            self.apply_ui_sizes()
 
     # BUTTON ACTIONS
     def on_hit(self):
         # Player takes a card
-        card = self.game.player_hit()
-        self.add_card(self.playerCardsLayout, card)
+        self.game.player_hit()
+        # only the new card gets a label; the others are left untouched
+        self.show_cards(self.playerCardsLayout, self.playerCardLabels, self.game.player_hand)
 
         self.update_player_total_label()
 
-        if self.game.player_total() > 21:
+        if self.game.player_total() <= 21:
+            # the new hand gets fresh odds; the old estimate is dropped
+            self.request_advice()
+        else:
             # TODO: what should happen if a player goes over 21? Remove pass when complete
             # player busts: reveal dealer, decide winner and end round
+            self.game.reveal_dealer_card()
             self.update_dealer_cards(full=True)
             result_text = self.game.decide_winner()
             self.statusLabel.setText(result_text)
@@ -400,7 +434,10 @@ class MainWindow(QMainWindow):
 
     def on_stand(self):
         # TODO: Player ends turn; dealer reveals their hidden card and plays. Remove pass when complete
+        self.advisor.cancel()
+
         # reveal dealer hidden card
+        self.game.reveal_dealer_card()
         self.update_dealer_cards(full=True)
 
         # dealer plays according to rules
@@ -421,37 +458,53 @@ class MainWindow(QMainWindow):
         self.new_round_setup()
 
     # HELPER METHODS
-    def clear_layout(self, layout):
-        # Remove all widgets from a layout
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-    def add_card(self, layout, card_text):
-        # Create a QLabel showing the card value and add it to the chosen layout.
-        label = QLabel(card_text)
+    def take_card_label(self):
+        # Reuse a hidden card label from the pool, or create one if it is empty.
+        if self.spareCardLabels:
+            return self.spareCardLabels.pop()
+
+        label = QLabel()
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         label.setProperty("card", True)
-
-        # mark hearts/diamonds as red using a property (keeps card shape style)
-        if card_text not in ("??", ""):
-            suit = card_text[-1]
-            if suit in ("♥", "♦"):
-                label.setProperty("red", True)
-
+        return label
+
+    def set_card_face(self, label, card_text):
+        # the face comes ready-drawn from the atlas (card_atlas.py)
+        label.setPixmap(self.card_atlas.pixmap(card_text))
+        label.setProperty("cardText", card_text)
+        label.setAccessibleName(card_text)
+
+    def add_card(self, layout, labels, card_text):
+        # Show one more card at the end of the chosen layout.
+        label = self.take_card_label()
+        self.set_card_face(label, card_text)
         layout.addWidget(label)
+        label.show()
+        labels.append(label)
+
+    def show_cards(self, layout, labels, cards):
+        # Make the layout show `cards`, only touching labels that differ:
+        # changed cards get a new face, new cards are added and leftover
+        # labels are hidden and returned to the pool instead of deleted.
+        for i, card_text in enumerate(cards):
+            if i >= len(labels):
+                self.add_card(layout, labels, card_text)
+            elif labels[i].property("cardText") != card_text:
+                self.set_card_face(labels[i], card_text)
+
+        while len(labels) > len(cards):
+            label = labels.pop()
+            layout.removeWidget(label)
+            label.hide()
+            self.spareCardLabels.append(label)
 
     def update_dealer_cards(self, full=False):
         # Show dealer cards; hide the first card until revealed
-        self.clear_layout(self.dealerCardsLayout)
+        cards = list(self.game.dealer_hand)
+        if cards and not full:
+            cards[0] = "??"  # face-down
 
-        for i, card in enumerate(self.game.dealer_hand):
-            if i == 0 and not full:
-                self.add_card(self.dealerCardsLayout, "??")  # face-down
-            else:
-                self.add_card(self.dealerCardsLayout, card)
+        self.show_cards(self.dealerCardsLayout, self.dealerCardLabels, cards)
 
         # TODO: update relevant labels in response to dealer actions. Remove pass when complete
         if full:
@@ -470,15 +523,12 @@ class MainWindow(QMainWindow):
 
     def new_round_setup(self):
         # TODO: Prepare a fresh visual layout
-        self.clear_layout(self.playerCardsLayout)
-        self.clear_layout(self.dealerCardsLayout)
-
         # deal initial cards into the model
         self.game.deal_initial_cards()
 
         # TODO: update relevant labels (reset dealer and player totals)
-        for card in self.game.player_hand:
-            self.add_card(self.playerCardsLayout, card)
+        # existing card labels are reused, extra ones go back to the pool
+        self.show_cards(self.playerCardsLayout, self.playerCardLabels, self.game.player_hand)
 
         self.update_dealer_cards(full=False)
         self.update_player_total_label()
@@ -495,12 +545,34 @@ class MainWindow(QMainWindow):
         self.standButton.setEnabled(True)
         self.newRoundButton.setEnabled(False)
 
+        self.request_advice()
+
     def end_round(self):
         # TODO: Disable button actions after the round ends. Remove pass when complete
         self.hitButton.setEnabled(False)
         self.standButton.setEnabled(False)
         self.newRoundButton.setEnabled(True)
 
+        self.advisor.cancel()
+        self.advisorLabel.setText("")
+
+    # ADVISOR
+    def request_advice(self):
+        # only a snapshot is taken here; the work happens in the advisor's worker process
+        self.advisorLabel.setText("Working out the odds...")
+        self.advisor.request(self.game)
+
+    def show_advice(self, result):
+        self.advisorLabel.setText(
+            f"If you stand: win {result['win']:.0%} · push {result['push']:.0%} · "
+            f"lose {result['lose']:.0%}  —  suggested: {result['action'].capitalize()}"
+        )
+
+    def closeEvent(self, event):
+        # don't leave a worker running while the window goes away
+        self.advisor.shutdown()
+        super().closeEvent(event)
+
     def update_score_labels(self):
         # helper to sync labels with game logic stats
         self.playerWinsLabel.setText(f"Player wins: {self.game.player_wins}")
@@ -509,35 +581,19 @@ class MainWindow(QMainWindow):
 
     def set_status_style(self, result_text: str):
         # small helper to visually emphasise result
-        if isinstance(result_text, str) and (
-                "Player busts" in result_text or result_text.startswith("Dealer wins")
-        ):
-            bg = "#7f1d1d"  # red-ish for bad outcome
-            border = "#e74c3c"
-        elif isinstance(result_text, str) and (
-                "Dealer busts" in result_text or result_text.startswith("Player wins")
-        ):
-            bg = "#145a32"  # green-ish for good outcome
-            border = "#2ecc71"
-        elif isinstance(result_text, str) and "Push" in result_text:
-            bg = "#7f6a1d"  # neutral
-            border = "#f1c40f"
-        else:
-            bg = "#145a32"
-            border = "#f1c40f"
-
-        self.statusLabel.setStyleSheet(f"""
-            background-color: {bg};
-            color: #f9f9f9;
-            font-size: 18px;
-            font-weight: bold;
-            border-radius: 16px;
-            padding: 10px 18px;
-            border: 2px solid {border};
-        """)
+        # all variants are already in the status stylesheet; only the property changes
+        outcome = theme.outcome_style(result_text)
+        if self.statusLabel.property("outcome") != outcome:
+            self.statusLabel.setProperty("outcome", outcome)
+            self.statusLabel.style().unpolish(self.statusLabel)
+            self.statusLabel.style().polish(self.statusLabel)
 
 # complete
 
+if instrumentation.requested():
+    # wrap the methods now, before any window connects its signals to them
+    instrumentation.enable(MainWindow)
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
 
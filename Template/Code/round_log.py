@@ -0,0 +1,219 @@
+import hashlib
+import os
+import struct
+
+from cards import CARD_CODES
+
+# APPEND-ONLY BINARY ROUND LOG
+# The file starts with an 8-byte header - HEADER: magic b"G21L", format
+# version, record size - so a reader never mistakes one layout for another.
+# After it, every finished round becomes one fixed-width little-endian record:
+#
+#   seed           u64   Game21 seed (see seed_to_u64), 0 if unseeded
+#   round          u32   round number within that game (1, 2, ...)
+#   n_player_cards u8    how many of player_cards are used
+#   n_dealer_cards u8    how many of dealer_cards are used
+#   player_cards   22 x u8  card codes (cards.py), padded with 0xFF
+#   dealer_cards   22 x u8
+#   n_actions      u8
+#   actions        22 x u8  ASCII action letters, e.g. b"HHS" (Hit, Stand)
+#   player_total   u8
+#   dealer_total   u8
+#   outcome        u8    outcome code from game_logic
+#   flags          u8    SEED_IS_INT when `seed` is the game's own integer seed
+#                        (not a hash), so the session can be re-run from it
+#
+# Writing only needs the standard library. Reading maps the file with NumPy
+# as a structured array, so huge logs are scanned without parsing text or
+# loading the whole file into memory.
+#
+# Version 1 logs had no header and 84-byte records without `flags`; open_log
+# still reads them (their rounds are replayed from the recorded cards), but
+# new rounds can't be appended to them.
+
+MAX_CARDS = 22  # a hand can't hold more cards than this before busting
+NO_CARD = 0xFF
+
+SEED_IS_INT = 1
+
+RECORD = struct.Struct(f"<QIBB{MAX_CARDS}s{MAX_CARDS}sB{MAX_CARDS}sBBBB")
+
+FILE_MAGIC = b"G21L"
+LOG_VERSION = 2
+HEADER = struct.Struct("<4sHH")  # magic, version, record size
+V1_RECORD_SIZE = RECORD.size - 1  # headerless version 1 records, no flags byte
+
+
+def read_header(path):
+    """
+    The log's format version, checked against this module's layout:
+    LOG_VERSION, 1 for a headerless version 1 log, or None for an empty
+    file. ValueError for anything else.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        f.seek(0, 2)
+        size = f.tell()
+    if size == 0:
+        return None
+    if len(header) == HEADER.size:
+        magic, version, record_size = HEADER.unpack(header)
+        if magic == FILE_MAGIC:
+            if version != LOG_VERSION or record_size != RECORD.size:
+                raise ValueError(f"{path} is a version {version} round log with {record_size}-byte "
+                                 f"records; this version reads version {LOG_VERSION} "
+                                 f"({RECORD.size}-byte records)")
+            if (size - HEADER.size) % RECORD.size:
+                raise ValueError(f"{path} ends in a partial record")
+            return LOG_VERSION
+    if size % V1_RECORD_SIZE == 0:
+        return 1
+    raise ValueError(f"{path} is not a round log")
+
+
+def seed_flags(seed):
+    # SEED_IS_INT when seed_to_u64 stores the seed itself
+    return SEED_IS_INT if isinstance(seed, int) and 0 <= seed < 2 ** 64 else 0
+
+
+def seed_to_u64(seed):
+    """
+    Fit a Game21 seed (int, str or None) into the 64-bit seed field.
+    Integers that fit are stored as-is, anything else as a stable hash.
+    """
+    if seed is None:
+        return 0
+    if seed_flags(seed):
+        return seed
+    digest = hashlib.blake2b(str(seed).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _card_bytes(hand):
+    codes = bytes(CARD_CODES.get(card, card) for card in hand)
+    return codes.ljust(MAX_CARDS, bytes([NO_CARD]))
+
+
+class RoundLogWriter:
+    """
+    Appends round records to a file through a write buffer.
+    Attach to a game with Game21(round_log=writer); close() (or use it as a
+    context manager) to flush the last records.
+    """
+
+    def __init__(self, path, buffer_rounds=4096):
+        self.path = path
+        self.rounds_written = 0
+        version = read_header(path) if os.path.exists(path) else None
+        if version == 1:
+            raise ValueError(f"{path} is a version 1 round log; write new rounds to a new log")
+        self._file = open(path, "ab", buffering=RECORD.size * buffer_rounds)
+        if version is None:
+            self._file.write(HEADER.pack(FILE_MAGIC, LOG_VERSION, RECORD.size))
+
+    def write_round(self, game, round_number, outcome):
+        actions = bytes(game.actions)
+        self._file.write(RECORD.pack(
+            seed_to_u64(game.seed),
+            round_number,
+            len(game.player_hand),
+            len(game.dealer_hand),
+            _card_bytes(game.player_hand),
+            _card_bytes(game.dealer_hand),
+            len(actions),
+            actions,
+            game.player_total(),
+            game.dealer_total(),
+            outcome,
+            seed_flags(game.seed),
+        ))
+        self.rounds_written += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# READING AND ANALYTICS
+
+def record_dtype(version=LOG_VERSION):
+    """
+    NumPy structured dtype with the same layout as RECORD (or as a
+    version 1 record, which has no `flags`).
+    """
+    import numpy as np
+
+    fields = [
+        ("seed", "<u8"),
+        ("round", "<u4"),
+        ("n_player_cards", "u1"),
+        ("n_dealer_cards", "u1"),
+        ("player_cards", "u1", (MAX_CARDS,)),
+        ("dealer_cards", "u1", (MAX_CARDS,)),
+        ("n_actions", "u1"),
+        ("actions", "u1", (MAX_CARDS,)),
+        ("player_total", "u1"),
+        ("dealer_total", "u1"),
+        ("outcome", "u1"),
+        ("flags", "u1"),
+    ]
+    if version == 1:
+        fields.pop()
+    dtype = np.dtype(fields)
+    assert dtype.itemsize == (RECORD.size if version == LOG_VERSION else V1_RECORD_SIZE)
+    return dtype
+
+
+def open_log(path):
+    """
+    Memory-map a round log as a read-only structured array.
+    Pages are only read from disk when the records are used. The header is
+    checked first (see read_header); a version 1 log maps with its own
+    dtype, without `flags`.
+    """
+    import numpy as np
+
+    version = read_header(path)
+    if version is None:
+        return np.zeros(0, dtype=record_dtype())
+    if version == 1:
+        return np.memmap(path, dtype=record_dtype(1), mode="r")
+    if os.path.getsize(path) == HEADER.size:
+        # header only - memmap can't map zero records
+        return np.zeros(0, dtype=record_dtype())
+    return np.memmap(path, dtype=record_dtype(), mode="r", offset=HEADER.size)
+
+
+def summarize(records, chunk_rows=1_000_000):
+    """
+    Win, push and bust rates for a (memory-mapped) record array.
+    Works through the records in chunks so memory use stays bounded.
+    """
+    import numpy as np
+    from game_logic import OUTCOME_MESSAGES, PLAYER_BUST, PLAYER_WIN, DEALER_BUST, PUSH
+
+    outcomes = np.zeros(len(OUTCOME_MESSAGES), dtype=np.int64)
+    dealer_busts = 0
+    for start in range(0, len(records), chunk_rows):
+        chunk = records[start:start + chunk_rows]
+        outcomes += np.bincount(chunk["outcome"], minlength=len(OUTCOME_MESSAGES))
+        dealer_busts += int(np.count_nonzero(chunk["dealer_total"] > 21))
+
+    rounds = len(records)
+    total = max(rounds, 1)
+    return {
+        "rounds": rounds,
+        "outcomes": {message: int(n) for message, n in zip(OUTCOME_MESSAGES, outcomes)},
+        "player_win_rate": float(outcomes[PLAYER_WIN] + outcomes[DEALER_BUST]) / total,
+        "push_rate": float(outcomes[PUSH]) / total,
+        "player_bust_rate": float(outcomes[PLAYER_BUST]) / total,
+        "dealer_bust_rate": dealer_busts / total,
+    }
@@ -0,0 +1,113 @@
+# TABLE RULES
+# A RuleSet describes one table variant. The dealer's hit/stand rule is
+# compiled once into a 64-entry table indexed by (hard total, holds an Ace),
+# the same pair every hand already keeps (see Hand), so playing the dealer
+# is one lookup per card whatever the rules are:
+#
+#     hits = rules.dealer_hits
+#     while hits[hand.hard_total * 2 + (hand.aces > 0)]:
+#         ...draw...
+#
+# Hard totals 0..31 cover every hand the dealer can reach (16 + a ten + ...).
+
+DEALER_TABLE_SIZE = 64
+
+
+def dealer_hit_table(hits_soft_17=False):
+    """
+    Return the dealer hit table as bytes: entry hard * 2 + has_ace is 1 when
+    the dealer must draw. The dealer hits below 17, and also on a soft 17
+    (an Ace counted as 11) when `hits_soft_17` is set.
+    """
+    table = bytearray(DEALER_TABLE_SIZE)
+    for hard in range(DEALER_TABLE_SIZE // 2):
+        for has_ace in (0, 1):
+            soft = has_ace and hard <= 11
+            best = hard + 10 if soft else hard
+            table[hard * 2 + has_ace] = best < 17 or (hits_soft_17 and soft and best == 17)
+    return bytes(table)
+
+
+class RuleSet:
+    """
+    Rules for one table variant:
+    - dealer_hits_soft_17: dealer draws to a soft 17 (default: stands on all 17s)
+    - blackjack_payout: pay a natural (Ace + ten-valued card as the first two
+      cards) this many bets, e.g. 1.5 for 3:2. A natural then also beats a
+      dealer 21 made with more cards. None (default) treats it as any 21.
+    - allow_double: player may double the bet on the first two cards and
+      take exactly one more card
+    - allow_surrender: player may give up the first two cards and lose half the bet
+
+    The defaults are the original Game of 21 rules. Doubling and surrender
+    are only taken by players that follow the strategy table (the "basic"
+    policy, Game21.recommended_action); fixed stand-on-N players (batch
+    engine, bankroll simulator) never use them.
+    """
+
+    def __init__(self, dealer_hits_soft_17=False, blackjack_payout=None,
+                 allow_double=False, allow_surrender=False):
+        if blackjack_payout is not None and blackjack_payout < 1:
+            raise ValueError("blackjack_payout must be at least 1 (or None for no bonus)")
+
+        self.dealer_hits_soft_17 = bool(dealer_hits_soft_17)
+        self.blackjack_payout = blackjack_payout
+        self.allow_double = bool(allow_double)
+        self.allow_surrender = bool(allow_surrender)
+
+        self.dealer_hits = dealer_hit_table(self.dealer_hits_soft_17)
+
+    def dealer_must_hit(self, hard_total, has_ace):
+        return bool(self.dealer_hits[hard_total * 2 + bool(has_ace)])
+
+    # COMPARISON AND PLAIN DATA
+
+    def key(self):
+        # hashable summary, used for equality and cache keys
+        return (self.dealer_hits_soft_17, self.blackjack_payout,
+                self.allow_double, self.allow_surrender)
+
+    def __eq__(self, other):
+        return isinstance(other, RuleSet) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return (f"RuleSet(dealer_hits_soft_17={self.dealer_hits_soft_17}, "
+                f"blackjack_payout={self.blackjack_payout}, allow_double={self.allow_double}, "
+                f"allow_surrender={self.allow_surrender})")
+
+    def to_dict(self):
+        return {
+            "dealer_hits_soft_17": self.dealer_hits_soft_17,
+            "blackjack_payout": self.blackjack_payout,
+            "allow_double": self.allow_double,
+            "allow_surrender": self.allow_surrender,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+DEFAULT_RULES = RuleSet()
+
+# named variants for the command line
+VARIANTS = {
+    "classic": DEFAULT_RULES,
+    "h17": RuleSet(dealer_hits_soft_17=True),
+    "casino": RuleSet(blackjack_payout=1.5, allow_double=True, allow_surrender=True),
+    "casino-h17": RuleSet(dealer_hits_soft_17=True, blackjack_payout=1.5,
+                          allow_double=True, allow_surrender=True),
+}
+
+
+def get_rules(name):
+    """
+    Look up a named variant (see VARIANTS).
+    """
+    try:
+        return VARIANTS[name]
+    except KeyError:
+        raise ValueError(f"unknown rules {name!r}, choose from {', '.join(VARIANTS)}") from None
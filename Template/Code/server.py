@@ -0,0 +1,219 @@
+"""
+Asyncio game server: one Game21 session per connection.
+
+Protocol - one request per line, one JSON reply per line. A request is
+either a bare command word or a JSON object with a "cmd" key:
+
+    new          start a round (deal two cards each)
+    hit          player takes a card
+    stand        dealer reveals and plays, round is decided
+    stats        wins / losses / pushes for this session
+    quit         close the connection
+
+    e.g.  hit
+          {"cmd": "stand"}
+
+Replies look like {"ok": true, "player": [...], "dealer": [...], ...}
+or {"ok": false, "error": "..."}. Connections idle for longer than the
+idle timeout are closed.
+
+Run from the Code folder:
+    python -m server --port 8021
+    python -m server --unix /tmp/game21.sock
+    python -m server --compact      (CompactGame21 sessions, see compact.py)
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from compact import CompactGame21, ShoeArena
+from game_logic import Game21
+
+IDLE_TIMEOUT = 300.0  # seconds without a request before a session is evicted
+BACKLOG = 1024  # pending connections; the default 100 drops bursts of clients
+
+
+class Session:
+    """
+    One player's game, driven by protocol commands.
+    """
+
+    def __init__(self, num_decks=1, seed=None, shoes=None):
+        if shoes is not None:
+            self.game = CompactGame21(shoes=shoes)
+        else:
+            self.game = Game21(num_decks, seed=seed)
+        self.in_round = False
+
+    def close(self):
+        if isinstance(self.game, CompactGame21):
+            self.game.close()
+
+    def handle(self, command):
+        handler = getattr(self, "cmd_" + command, None)
+        if handler is None:
+            return error_reply(f"unknown command {command!r}")
+        return handler()
+
+    # COMMANDS
+
+    def cmd_new(self):
+        self.game.new_round()
+        self.game.deal_initial_cards()
+        self.in_round = True
+        return self.table_reply()
+
+    def cmd_hit(self):
+        if not self.in_round:
+            return error_reply("no round in progress - send 'new'")
+        self.game.player_hit()
+        if self.game.player_total() > 21:
+            # same as MainWindow.on_hit: a bust ends the round straight away
+            return self.finish_round()
+        return self.table_reply()
+
+    def cmd_stand(self):
+        if not self.in_round:
+            return error_reply("no round in progress - send 'new'")
+        self.game.reveal_dealer_card()
+        self.game.play_dealer_turn()
+        return self.finish_round()
+
+    def cmd_stats(self):
+        game = self.game
+        return {
+            "ok": True,
+            "player_wins": game.player_wins,
+            "dealer_wins": game.dealer_wins,
+            "pushes": game.pushes,
+        }
+
+    # REPLIES
+
+    def finish_round(self):
+        self.game.reveal_dealer_card()
+        result = self.game.decide_winner()
+        self.in_round = False
+        reply = self.table_reply()
+        reply["result"] = result
+        return reply
+
+    def table_reply(self):
+        game = self.game
+        dealer = list(game.dealer_hand)
+        if dealer and not game.dealer_hidden_revealed:
+            dealer[0] = "??"  # face-down until the player stands
+        return {
+            "ok": True,
+            "player": list(game.player_hand),
+            "dealer": dealer,
+            "player_total": game.player_total(),
+            "dealer_total": game.dealer_total() if game.dealer_hidden_revealed else None,
+            "result": None,
+        }
+
+
+def error_reply(message):
+    return {"ok": False, "error": message}
+
+
+def parse_command(line):
+    """
+    Return the command word from a request line (bare word or JSON object).
+    """
+    line = line.strip()
+    if line.startswith(b"{"):
+        request = json.loads(line)
+        return str(request.get("cmd", "")).lower()
+    return line.decode("utf-8", "replace").lower()
+
+
+class GameServer:
+    """
+    Accepts connections and keeps one Session per connection.
+    """
+
+    def __init__(self, num_decks=1, idle_timeout=IDLE_TIMEOUT, compact=False):
+        self.num_decks = num_decks
+        self.idle_timeout = idle_timeout
+        # compact sessions all deal from one shared ShoeArena
+        self.shoes = ShoeArena(num_decks) if compact else None
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.evicted_sessions = 0
+
+    async def handle_connection(self, reader, writer):
+        session = Session(self.num_decks, shoes=self.shoes)
+        self.active_sessions += 1
+        self.total_sessions += 1
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.evicted_sessions += 1
+                    await self.send(writer, error_reply("idle timeout - session closed"))
+                    break
+                if not line:
+                    break  # client closed the connection
+
+                try:
+                    command = parse_command(line)
+                except ValueError:
+                    reply = error_reply("request is not valid JSON")
+                else:
+                    if command == "quit":
+                        break
+                    reply = session.handle(command)
+                await self.send(writer, reply)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            session.close()
+            writer.close()
+
+    async def send(self, writer, reply):
+        writer.write(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=8021, unix_path=None):
+        if unix_path:
+            return await asyncio.start_unix_server(
+                self.handle_connection, path=unix_path, backlog=BACKLOG)
+        return await asyncio.start_server(self.handle_connection, host, port, backlog=BACKLOG)
+
+
+async def serve(host="127.0.0.1", port=8021, unix_path=None, num_decks=1,
+                idle_timeout=IDLE_TIMEOUT, compact=False):
+    game_server = GameServer(num_decks, idle_timeout, compact)
+    server = await game_server.start(host, port, unix_path)
+    where = unix_path or f"{host}:{port}"
+    print(f"Game of 21 server listening on {where}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m server", description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8021)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--decks", type=int, default=1, help="decks per session shoe (default 1)")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help=f"seconds before an idle session is closed (default {IDLE_TIMEOUT:g})")
+    parser.add_argument("--compact", action="store_true",
+                        help="use memory-compact sessions (for very many connections)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.decks, args.idle_timeout,
+                          args.compact))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
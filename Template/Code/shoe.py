@@ -0,0 +1,224 @@
+import random
+from array import array
+
+from cards import CARD_HARD_VALUES, DECK_SIZE, RANKS, new_deck
+
+MIN_DECKS = 1
+MAX_DECKS = 8
+
+# card code -> rank index (0 = Ace .. 12 = King)
+RANK_OF = bytes(code // 4 for code in range(DECK_SIZE))
+TEN_RANKS = range(9, 13)  # 10, J, Q, K
+
+# Hi-Lo count by rank: 2-6 count +1, 7-9 count 0, tens and Aces count -1
+HI_LO_BY_RANK = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
+HI_LO = tuple(HI_LO_BY_RANK[RANK_OF[code]] for code in range(DECK_SIZE))
+
+# bytes.translate tables (card code -> rank index, and -> Hi-Lo count + 1),
+# so a whole shoe is counted with a few C-level bytes.count calls
+RANK_TABLE = RANK_OF.ljust(256, b"\0")
+HI_LO_TABLE = bytes(count + 1 for count in HI_LO).ljust(256, b"\1")
+
+
+def worst_case_cards(num_decks, hands):
+    """
+    Most cards one round can use with `hands` hands, the dealer's included.
+    Every card of a hand but the last keeps its hard total at 20 or less,
+    so the round can't use more cards than the smallest cards of the shoe
+    fitting in 20 per hand, plus one last card per hand.
+    """
+    values = sorted(CARD_HARD_VALUES * num_decks)
+    budget = 20 * hands
+    cards = 0
+    for value in values:
+        if value > budget:
+            break
+        budget -= value
+        cards += 1
+    return min(cards + hands, len(values))
+
+
+class Shoe:
+    """
+    A dealing shoe of 1–8 decks, stored as one bytearray of card codes.
+
+    The shoe is built once and shuffled in place. Rounds keep dealing from
+    `position` until the cut card is reached; only then is the whole shoe
+    reshuffled (checked by Game21.new_round between rounds, which also
+    reshuffles early when the cards left might not cover a whole round -
+    see worst_case_cards - since draw() would otherwise reshuffle cards
+    that are still in the hands).
+
+    What is left is tracked as cards are drawn, so it can be read at any time
+    without scanning the undealt cards: `rank_counts` (cards left per rank,
+    Ace first) and the Hi-Lo `running_count` of every card dealt since the
+    shuffle. Both are updated in constant time by draw().
+    """
+
+    def __init__(self, num_decks=1, penetration=0.75, rng=None, source=None):
+        if not MIN_DECKS <= num_decks <= MAX_DECKS:
+            raise ValueError(f"num_decks must be between {MIN_DECKS} and {MAX_DECKS}")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be greater than 0 and at most 1")
+
+        self.num_decks = num_decks
+        self.penetration = penetration
+        # anything with a shuffle() method, e.g. the random module or random.Random
+        self.rng = rng if rng is not None else random
+        # optional supplier of ready-shuffled shoes (shoe_factory.ShoeFactory);
+        # when set, reshuffling takes its next shoe instead of using rng
+        if source is not None and source.num_decks != num_decks:
+            raise ValueError("the shoe source must make shoes of the same number of decks")
+        self.source = source
+
+        self.cards = new_deck() * num_decks
+        # cards dealt before the cut card comes out
+        self.cut_card = int(len(self.cards) * penetration)
+        self.position = 0
+        self.shuffle()
+
+    def shuffle(self):
+        # one in-place shuffle of the whole shoe (or the source's next shoe),
+        # then start dealing from the top
+        if self.source is not None:
+            self.cards = bytearray(self.source.next_shoe())
+        else:
+            self.rng.shuffle(self.cards)
+        self.position = 0
+        self._recount()
+
+    def _recount(self):
+        # rebuild the composition from the undealt cards (only after the
+        # shoe is replaced; draw() keeps it up to date from then on)
+        ranks = self.cards[self.position:].translate(RANK_TABLE)
+        self.rank_counts = array("H", [ranks.count(rank) for rank in range(len(RANKS))])
+        counts = self.cards[:self.position].translate(HI_LO_TABLE)
+        self.running_count = counts.count(2) - counts.count(0)
+
+    @property
+    def needs_shuffle(self):
+        return self.position >= self.cut_card
+
+    @property
+    def cards_remaining(self):
+        return len(self.cards) - self.position
+
+    # COMPOSITION QUERIES
+
+    @property
+    def true_count(self):
+        # running count per deck still to be dealt
+        remaining = len(self.cards) - self.position
+        if not remaining:
+            return 0.0
+        return self.running_count * DECK_SIZE / remaining
+
+    def rank_remaining(self, rank):
+        """
+        Cards of `rank` ('A', '10', 'K' or the rank index) left in the shoe.
+        """
+        if isinstance(rank, str):
+            rank = RANKS.index(rank)
+        return self.rank_counts[rank]
+
+    def ten_count(self):
+        counts = self.rank_counts
+        return counts[9] + counts[10] + counts[11] + counts[12]
+
+    def probability_ten(self):
+        """
+        Chance that the next card is ten-valued (10, J, Q or K).
+        """
+        remaining = len(self.cards) - self.position
+        return self.ten_count() / remaining if remaining else 0.0
+
+    def value_counts(self):
+        """
+        Cards left per value class, in the dealer_odds order:
+        Aces, 2..9, then all ten-valued cards.
+        """
+        counts = self.rank_counts
+        return (counts[0], counts[1], counts[2], counts[3], counts[4],
+                counts[5], counts[6], counts[7], counts[8], self.ten_count())
+
+    # SNAPSHOT / RESTORE
+
+    def snapshot(self):
+        """
+        Plain-data copy of the shoe (JSON-friendly): order, position, RNG
+        state and the shoe source's state, if there is one.
+        """
+        version, internal_state, gauss_next = self.rng.getstate()
+        return {
+            "num_decks": self.num_decks,
+            "penetration": self.penetration,
+            "cards": self.cards.hex(),
+            "position": self.position,
+            "rng_state": [version, list(internal_state), gauss_next],
+            "source": self.source.snapshot() if self.source is not None else None,
+        }
+
+    def restore(self, state):
+        """
+        Put the shoe back exactly as it was when snapshot() was taken.
+        The shoe gets its own random.Random, so restoring never changes
+        the global random module.
+        """
+        self.num_decks = state["num_decks"]
+        self.penetration = state["penetration"]
+        self.cards = bytearray.fromhex(state["cards"])
+        self.cut_card = int(len(self.cards) * self.penetration)
+        self.position = state["position"]
+        self._recount()
+
+        version, internal_state, gauss_next = state["rng_state"]
+        self.rng = random.Random()
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+
+        # snapshots from before shoe sources existed leave the source alone
+        if "source" in state:
+            self.source = None
+            if state["source"] is not None:
+                # numpy is only needed when the game used a ShoeFactory
+                from shoe_factory import ShoeFactory
+
+                self.source = ShoeFactory.from_snapshot(state["source"])
+
+    def load_cards(self, cards):
+        """
+        Deal the given card codes next, in order (used to replay a logged round).
+        """
+        self.cards = bytearray(cards)
+        self.cut_card = len(self.cards)
+        self.position = 0
+        self._recount()
+
+    def draw_many(self, count):
+        """
+        Return the next `count` card codes as one slice of the shoe
+        (e.g. the whole initial deal of a table).
+        """
+        end = self.position + count
+        if end > len(self.cards):
+            # runs past the end - draw one by one so the shoe reshuffles
+            return bytearray(self.draw() for _ in range(count))
+        cards = self.cards[self.position:end]
+        self.position = end
+        rank_counts = self.rank_counts
+        for code in cards:
+            rank_counts[RANK_OF[code]] -= 1
+        self.running_count += sum(map(HI_LO.__getitem__, cards))
+        return cards
+
+    def draw(self):
+        """
+        Return the next card code from the shoe.
+        """
+        if self.position >= len(self.cards):
+            # only possible with a very deep cut card - reshuffle instead of running dry
+            self.shuffle()
+        code = self.cards[self.position]
+        self.position += 1
+        self.rank_counts[RANK_OF[code]] -= 1
+        self.running_count += HI_LO[code]
+        return code
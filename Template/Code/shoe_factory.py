@@ -0,0 +1,155 @@
+import sys
+from collections import deque
+
+import numpy as np
+
+from cards import DECK_SIZE
+from shoe import MIN_DECKS, MAX_DECKS
+
+# BULK SHOE GENERATION
+# Shuffling one shoe with random.shuffle is a Python loop over every card
+# (about half a millisecond for six decks). A ShoeFactory shuffles a whole
+# batch of shoes at once: one row of random keys per shoe, argsorted along
+# the rows, gives an independent uniform permutation per row. Finished shoes
+# wait in a prefetch queue, so handing one out is a popleft, and the next
+# batch is only generated once the queue runs dry.
+#
+# Plug a factory into a Shoe (or Game21) as its `source` and every reshuffle
+# pulls the next ready shoe instead of shuffling in Python:
+#
+#     game = Game21(6, shoe_source=ShoeFactory(6, seed=1))
+
+BATCH_SIZE = 1024
+MAX_Z = 4.0  # uniformity_check limit; an unbiased shuffle passes this almost always
+
+
+def shuffled_shoes(count, num_decks, rng):
+    """
+    `count` independently shuffled shoes of `num_decks` decks as a 2-D uint8
+    array, one shoe per row, from the numpy Generator `rng`. This is the one
+    bulk shuffle - the batch engine and bankroll simulator use it too.
+    """
+    base = np.tile(np.arange(DECK_SIZE, dtype=np.uint8), num_decks)
+    # float64 keys: a tie (which argsort would break by position, biasing
+    # the shuffle) is vanishingly unlikely even for eight decks
+    keys = rng.random((count, base.size))
+    return base[keys.argsort(axis=1)]
+
+
+class ShoeFactory:
+    """
+    Shuffled shoes of `num_decks` decks, generated `batch_size` at a time
+    with a numpy Generator. The same seed gives the same shoes in the same
+    order.
+    """
+
+    def __init__(self, num_decks=1, batch_size=BATCH_SIZE, seed=None):
+        if not MIN_DECKS <= num_decks <= MAX_DECKS:
+            raise ValueError(f"num_decks must be between {MIN_DECKS} and {MAX_DECKS}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.num_decks = num_decks
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.shoe_size = num_decks * DECK_SIZE
+        self.queue = deque()
+        # generator state the queued batch was made from (see snapshot)
+        self.batch_state = self.rng.bit_generator.state
+
+    def generate(self, count):
+        """
+        `count` freshly shuffled shoes as a 2-D uint8 array, one shoe per row.
+        """
+        return shuffled_shoes(count, self.num_decks, self.rng)
+
+    def refill(self):
+        # one batch into the queue; splitting the raw bytes is much cheaper
+        # than converting every row separately
+        size = self.shoe_size
+        self.batch_state = self.rng.bit_generator.state
+        data = self.generate(self.batch_size).tobytes()
+        self.queue.extend(data[start:start + size] for start in range(0, len(data), size))
+
+    def next_shoe(self):
+        """
+        The next shuffled shoe as bytes of card codes.
+        """
+        if not self.queue:
+            self.refill()
+        return self.queue.popleft()
+
+    def __len__(self):
+        # shoes ready in the queue
+        return len(self.queue)
+
+    # SNAPSHOT / RESTORE
+    # Only the generator state the queued batch came from and the number of
+    # shoes still queued are kept: restoring makes that batch again and skips
+    # the shoes already handed out, so the snapshot stays a few numbers.
+
+    def snapshot(self):
+        return {
+            "num_decks": self.num_decks,
+            "batch_size": self.batch_size,
+            # once the queue is empty the next batch starts from the current state
+            "batch_state": self.batch_state if self.queue else self.rng.bit_generator.state,
+            "queued": len(self.queue),
+        }
+
+    @classmethod
+    def from_snapshot(cls, state):
+        factory = cls(state["num_decks"], state["batch_size"])
+        factory.rng.bit_generator.state = state["batch_state"]
+        factory.batch_state = state["batch_state"]
+        if state["queued"]:
+            factory.refill()
+            for _ in range(factory.batch_size - state["queued"]):
+                factory.queue.popleft()
+        return factory
+
+
+# DISTRIBUTION CHECK
+
+def uniformity_check(shoes=52_000, num_decks=1, seed=0):
+    """
+    Chi-square test that every card is equally likely at every position of
+    the shoe. Returns (chi-square, degrees of freedom, z score); |z| stays
+    under MAX_Z for an unbiased shuffle. The seed is fixed, so the result
+    is the same on every run.
+    """
+    factory = ShoeFactory(num_decks, seed=seed)
+    size = num_decks * DECK_SIZE
+    counts = np.zeros((size, DECK_SIZE), dtype=np.int64)
+    positions = np.arange(size)
+    done = 0
+    while done < shoes:
+        batch = factory.generate(min(BATCH_SIZE, shoes - done))
+        np.add.at(counts, (np.broadcast_to(positions, batch.shape), batch), 1)
+        done += len(batch)
+
+    expected = shoes / DECK_SIZE
+    chi_square = float(((counts - expected) ** 2 / expected).sum())
+    # every position and every card has a fixed total
+    freedom = (size - 1) * (DECK_SIZE - 1)
+    z = (chi_square - freedom) / (2 * freedom) ** 0.5
+    return chi_square, freedom, z
+
+
+def main():
+    """
+    Run the uniformity check for one and six decks. Returns the exit code:
+    1 if either looks biased.
+    """
+    biased = False
+    for decks in (1, 6):
+        chi_square, freedom, z = uniformity_check(num_decks=decks)
+        ok = abs(z) < MAX_Z
+        biased = biased or not ok
+        print(f"{decks} deck(s): chi-square {chi_square:,.0f} on {freedom:,} d.f., "
+              f"z = {z:+.2f} ({'ok' if ok else 'BIASED'})")
+    return 1 if biased else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import random
+
+from game_logic import Game21, PLAYER_BUST, DEALER_BUST, PLAYER_WIN, DEALER_WIN, PUSH, SURRENDER
+from stats import StreamingStats
+import strategy
+
+# HEADLESS SIMULATION
+# Rounds are split into fixed-size chunks. Every chunk plays on its own Game21
+# whose random.Random is seeded from (seed, chunk number), so the same seed
+# gives the same totals whether the chunks run in one process or in many.
+# Each chunk keeps a StreamingStats collector; the collectors are merged in
+# chunk order, which also lets a run stop early once it is precise enough.
+
+CHUNK_ROUNDS = 10_000
+
+
+# PLAYER POLICIES
+# A policy looks at the game and returns True to hit, False to stand, or
+# strategy.DOUBLE / strategy.SURRENDER (only offered when the rules allow
+# it, see Game21.can_double / can_surrender).
+
+def stand_on_17(game):
+    # same rule as the dealer
+    return game.player_hand.total < 17
+
+
+def never_bust(game):
+    # only hit when no card can bust the hand
+    return game.player_hand.hard_total <= 11
+
+
+def basic_strategy(game):
+    action = game.recommended_action()
+    if action in (strategy.DOUBLE, strategy.SURRENDER):
+        return action
+    return action == strategy.HIT
+
+
+POLICIES = {
+    "stand17": stand_on_17,
+    "never-bust": never_bust,
+    "basic": basic_strategy,
+}
+
+
+def play_round(game, policy):
+    """
+    Play one full round without the UI, the same way MainWindow does:
+    deal, let the policy hit (or double / surrender), then the dealer plays
+    unless the player bust or surrendered.
+    Updates the game's win counters and returns the outcome code.
+    """
+    game.new_round()
+    game.deal_initial_cards()
+
+    surrendered = False
+    while game.player_hand.total < 21:
+        move = policy(game)
+        if move == strategy.DOUBLE:
+            game.player_double()
+            break
+        if move == strategy.SURRENDER:
+            game.player_surrender()
+            surrendered = True
+            break
+        if not move:
+            break
+        game.player_hit()
+
+    if not game.player_hand.is_bust and not surrendered:
+        game.reveal_dealer_card()
+        game.play_dealer_turn()
+
+    outcome = game.round_outcome()
+    game.decide_winner()
+    return outcome
+
+
+# CHUNKED RUNS
+
+def chunk_seed(seed, chunk):
+    # str seeds are hashed by random.Random, giving independent streams per chunk
+    return f"{seed}:{chunk}"
+
+
+def run_chunk(seed, chunk, rounds, policy="stand17", num_decks=1, penetration=0.75, rules=None,
+              bulk_shuffle=False):
+    """
+    Play `rounds` rounds for one chunk and return its StreamingStats.
+    With `bulk_shuffle` the shoes come pre-shuffled from a ShoeFactory
+    (needs numpy) seeded from the chunk seed.
+    """
+    policy_func = POLICIES[policy]
+    shoe_source = None
+    if bulk_shuffle:
+        from shoe_factory import ShoeFactory
+
+        factory_seed = random.Random(chunk_seed(seed, chunk)).getrandbits(64)
+        shoe_source = ShoeFactory(num_decks, seed=factory_seed)
+    game = Game21(num_decks, penetration, seed=chunk_seed(seed, chunk), rules=rules,
+                  shoe_source=shoe_source)
+    stats = StreamingStats()
+
+    for _ in range(rounds):
+        outcome = play_round(game, policy_func)
+        stats.update(outcome, game.player_hand.total, game.dealer_hand.total, game.round_net())
+    return stats
+
+
+def _run_chunk_args(args):
+    # ProcessPoolExecutor.map passes a single argument
+    return run_chunk(*args)
+
+
+def merge_results(results, target_half_width=None):
+    """
+    Merge chunk statistics in order. With a target half-width, stop as soon
+    as the 95% confidence interval of the mean net result is that narrow.
+    """
+    merged = StreamingStats()
+    for stats in results:
+        merged.merge(stats)
+        if target_half_width is not None and merged.precise_enough(target_half_width):
+            break
+    return merged
+
+
+def summarize(stats):
+    """
+    Plain counters for a merged StreamingStats (the collector itself is
+    kept under "stats" for confidence intervals and streaks).
+    """
+    outcomes = stats.outcomes
+    return {
+        "rounds": stats.rounds,
+        "player_wins": outcomes[DEALER_BUST] + outcomes[PLAYER_WIN],
+        "dealer_wins": outcomes[PLAYER_BUST] + outcomes[DEALER_WIN] + outcomes[SURRENDER],
+        "pushes": outcomes[PUSH],
+        "outcomes": list(outcomes),
+        "player_totals": list(stats.player_totals),
+        "dealer_totals": list(stats.dealer_totals),
+        "stats": stats,
+    }
+
+
+def simulate(rounds, seed=0, workers=1, policy="stand17", num_decks=1,
+             penetration=0.75, chunk_rounds=CHUNK_ROUNDS, target_half_width=None, rules=None,
+             bulk_shuffle=False):
+    """
+    Simulate up to `rounds` rounds, sharded across `workers` processes,
+    under the table `rules` (rules.RuleSet, default the original game).
+    With `target_half_width` the run stops after the first chunk at which the
+    95% confidence interval of the mean net result is within +/- that value.
+    `bulk_shuffle` deals from numpy-shuffled shoes (see run_chunk).
+    Returns the merged counters (see summarize).
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, choose from {', '.join(POLICIES)}")
+
+    chunks = [
+        (seed, chunk, min(chunk_rounds, rounds - start), policy, num_decks, penetration, rules,
+         bulk_shuffle)
+        for chunk, start in enumerate(range(0, rounds, chunk_rounds))
+    ]
+
+    if workers <= 1 or len(chunks) <= 1:
+        return summarize(merge_results(map(_run_chunk_args, chunks), target_half_width))
+
+    # imported here so single-process runs don't pay for it
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # results come back in chunk order, so an early stop is reproducible
+        stats = merge_results(pool.map(_run_chunk_args, chunks), target_half_width)
+    finally:
+        # drop chunks that are no longer needed after an early stop
+        pool.shutdown(cancel_futures=True)
+    return summarize(stats)
@@ -0,0 +1,188 @@
+import math
+
+from game_logic import PLAYER_BUST, OUTCOME_MESSAGES, OUTCOME_NET
+
+# STREAMING OUTCOME STATISTICS
+# Everything here is updated in O(1) time per round and uses a fixed amount of
+# memory, however many rounds are played. Two collectors can be merged, so
+# parallel workers can each keep one and the driver adds them together.
+
+MAX_TOTAL = 31  # highest possible final total (hard 20 + a ten)
+
+WIN = 1
+LOSS = -1
+NO_RESULT = 0  # push - ends both kinds of streak
+
+
+def _streak_kind(net):
+    if net > 0:
+        return WIN
+    if net < 0:
+        return LOSS
+    return NO_RESULT
+
+
+class StreamingStats:
+    """
+    Running statistics for a stream of rounds:
+    - mean and variance of the net result (Welford's algorithm)
+    - outcome counts and bust rate for each side
+    - histograms of final totals
+    - longest win and loss streaks
+    - normal-approximation confidence interval for the mean net result
+    """
+
+    def __init__(self):
+        self.rounds = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+
+        self.outcomes = [0] * len(OUTCOME_MESSAGES)
+        self.dealer_busts = 0
+        self.player_totals = [0] * (MAX_TOTAL + 1)
+        self.dealer_totals = [0] * (MAX_TOTAL + 1)
+
+        # streaks: first run, current (last) run and the longest of each kind.
+        # Keeping the first run as well lets batches be joined end to end.
+        self.first_kind = NO_RESULT
+        self.first_length = 0
+        self.last_kind = NO_RESULT
+        self.last_length = 0
+        self.longest_win_streak = 0
+        self.longest_loss_streak = 0
+
+    def update(self, outcome, player_total, dealer_total, net=None):
+        """
+        Add one finished round. `net` defaults to the even-money result of
+        the outcome (+1 win, -1 loss, 0 push).
+        """
+        if net is None:
+            net = OUTCOME_NET[outcome]
+
+        self.rounds += 1
+        delta = net - self.mean
+        self.mean += delta / self.rounds
+        self._m2 += delta * (net - self.mean)
+
+        self.outcomes[outcome] += 1
+        if dealer_total > 21:
+            self.dealer_busts += 1
+        self.player_totals[player_total] += 1
+        self.dealer_totals[dealer_total] += 1
+
+        kind = _streak_kind(net)
+        if kind == self.last_kind:
+            self.last_length += 1
+        else:
+            self.last_kind = kind
+            self.last_length = 1
+        if self.rounds == self.last_length:
+            # still inside the very first run
+            self.first_kind = kind
+            self.first_length = self.last_length
+        self._note_streak(self.last_kind, self.last_length)
+
+    def _note_streak(self, kind, length):
+        if kind == WIN:
+            self.longest_win_streak = max(self.longest_win_streak, length)
+        elif kind == LOSS:
+            self.longest_loss_streak = max(self.longest_loss_streak, length)
+
+    def merge(self, other):
+        """
+        Add the rounds of `other`, treating them as played after this
+        collector's rounds. Returns self.
+        """
+        if other.rounds == 0:
+            return self
+        if self.rounds == 0:
+            self.__dict__.update(_copy_state(other))
+            return self
+
+        # Chan et al. parallel combination of mean and M2
+        rounds = self.rounds + other.rounds
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.rounds * other.rounds / rounds
+        self.mean += delta * other.rounds / rounds
+
+        self.outcomes = [a + b for a, b in zip(self.outcomes, other.outcomes)]
+        self.dealer_busts += other.dealer_busts
+        self.player_totals = [a + b for a, b in zip(self.player_totals, other.player_totals)]
+        self.dealer_totals = [a + b for a, b in zip(self.dealer_totals, other.dealer_totals)]
+
+        self.longest_win_streak = max(self.longest_win_streak, other.longest_win_streak)
+        self.longest_loss_streak = max(self.longest_loss_streak, other.longest_loss_streak)
+
+        # a run can carry on across the join
+        joined = self.last_kind == other.first_kind
+        if joined:
+            self._note_streak(self.last_kind, self.last_length + other.first_length)
+        if joined and self.first_length == self.rounds:
+            self.first_length += other.first_length
+        if joined and other.last_length == other.rounds:
+            self.last_length += other.rounds
+        else:
+            self.last_kind = other.last_kind
+            self.last_length = other.last_length
+
+        self.rounds = rounds
+        return self
+
+    # DERIVED VALUES
+
+    @property
+    def variance(self):
+        # sample variance of the net result per round
+        if self.rounds < 2:
+            return 0.0
+        return self._m2 / (self.rounds - 1)
+
+    @property
+    def std_error(self):
+        if self.rounds < 2:
+            return math.inf
+        return math.sqrt(self.variance / self.rounds)
+
+    def confidence_interval(self, z=1.96):
+        """
+        (low, high) interval for the expected net result per round.
+        z = 1.96 gives 95%, 2.576 gives 99%.
+        """
+        half_width = z * self.std_error
+        return self.mean - half_width, self.mean + half_width
+
+    def precise_enough(self, half_width, z=1.96, min_rounds=1000):
+        """
+        True once the confidence interval is narrower than +/- half_width.
+        """
+        return self.rounds >= min_rounds and z * self.std_error <= half_width
+
+    def bust_rates(self):
+        rounds = max(self.rounds, 1)
+        return {
+            "player": self.outcomes[PLAYER_BUST] / rounds,
+            "dealer": self.dealer_busts / rounds,
+        }
+
+    def to_dict(self, z=1.96):
+        low, high = self.confidence_interval(z)
+        return {
+            "rounds": self.rounds,
+            "mean_net": self.mean,
+            "variance": self.variance,
+            "confidence_interval": [low, high] if self.rounds >= 2 else None,
+            "bust_rates": self.bust_rates(),
+            "outcomes": dict(zip(OUTCOME_MESSAGES, self.outcomes)),
+            "longest_win_streak": self.longest_win_streak,
+            "longest_loss_streak": self.longest_loss_streak,
+            "player_totals": self.player_totals,
+            "dealer_totals": self.dealer_totals,
+        }
+
+
+def _copy_state(stats):
+    state = dict(stats.__dict__)
+    for key, value in state.items():
+        if isinstance(value, list):
+            state[key] = list(value)
+    return state
@@ -0,0 +1,260 @@
+import os
+from array import array
+
+from dealer_odds import DealerOdds, CLASS_HARD_VALUES, OUTCOMES, VALUE_CLASSES, shoe_counts
+from rules import DEFAULT_RULES
+
+# OPTIMAL HIT / STAND TABLE
+# For every (player total, soft flag, dealer upcard) the solver works out the
+# expected value of standing and of hitting, using the exact dealer outcome
+# distribution from dealer_odds. Hitting is solved by dynamic programming from
+# the highest totals down, so no simulation is needed.
+#
+# Player draws use the shoe composition with the dealer upcard removed;
+# the cards the player draws are not taken out again (a small approximation
+# that keeps the table independent of the exact cards in the hand).
+#
+# The expected value of doubling (one more card, then stand, for two bets)
+# is stored too, so the first decision can also be "double" or "surrender"
+# (always -0.5) when the rules allow them. Only the dealer's rule (stand or
+# hit on soft 17) changes the numbers; the other RuleSet options just say
+# which moves are on offer, so they are passed in when looking up a move.
+#
+# The table is saved to a small binary file so later starts only load it.
+# The file header records the format version, the deck count and the dealer
+# rule; get_table re-solves when any of them differs from what was asked for.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "strategy_cache")
+
+FILE_MAGIC = b"G21S"
+FILE_VERSION = 3
+
+MAX_TOTAL = 21
+UPCARD_VALUES = tuple(range(2, 12))  # 2..10, Ace = 11 (Game21.card_value)
+TABLE_SIZE = (MAX_TOTAL + 1) * 2 * len(UPCARD_VALUES)
+
+HIT = "hit"
+STAND = "stand"
+DOUBLE = "double"
+SURRENDER = "surrender"
+
+SURRENDER_EV = -0.5
+
+
+def table_index(total, soft, upcard_value):
+    return ((total * 2) + bool(soft)) * len(UPCARD_VALUES) + upcard_value - 2
+
+
+def _upcard_class(upcard_value):
+    # card value (2..11) -> dealer_odds value class (0 = Ace)
+    return 0 if upcard_value == 11 else upcard_value - 1
+
+
+class StrategyTable:
+    """
+    Expected values of standing, hitting and doubling, plus the better of
+    hit and stand, stored in flat arrays so a lookup is a single index
+    calculation.
+    """
+
+    def __init__(self, num_decks, stand_ev, hit_ev, double_ev, hits_soft_17=False):
+        self.num_decks = num_decks
+        self.hits_soft_17 = hits_soft_17
+        self.stand_ev = stand_ev
+        self.hit_ev = hit_ev
+        self.double_ev = double_ev
+        self.hit_flags = bytearray(h > s for h, s in zip(hit_ev, stand_ev))
+
+    def action(self, total, soft, upcard_value, can_double=False, can_surrender=False):
+        """
+        Return "hit" or "stand" for the player's total against the dealer
+        upcard - or "double" / "surrender" when that move is allowed now
+        and has the best expected value.
+        """
+        if total >= MAX_TOTAL:
+            return STAND
+        index = table_index(total, soft, upcard_value)
+        if can_double or can_surrender:
+            best_ev = max(self.stand_ev[index], self.hit_ev[index])
+            best = None
+            if can_double and self.double_ev[index] > best_ev:
+                best_ev, best = self.double_ev[index], DOUBLE
+            if can_surrender and SURRENDER_EV > best_ev:
+                best = SURRENDER
+            if best is not None:
+                return best
+        if self.hit_flags[index]:
+            return HIT
+        return STAND
+
+    def expected_values(self, total, soft, upcard_value):
+        """
+        Return (stand EV, hit EV) in units of one bet.
+        """
+        if total > MAX_TOTAL:
+            return -1.0, -1.0
+        index = table_index(total, soft, upcard_value)
+        return self.stand_ev[index], self.hit_ev[index]
+
+    # SAVE / LOAD
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(FILE_MAGIC + bytes([FILE_VERSION, self.num_decks, self.hits_soft_17]))
+            self.stand_ev.tofile(f)
+            self.hit_ev.tofile(f)
+            self.double_ev.tofile(f)
+
+    @classmethod
+    def load(cls, path, num_decks=None, hits_soft_17=None):
+        """
+        Read a saved table. ValueError if the file is not a table of this
+        version, or was solved for another deck count or dealer rule than
+        the ones given.
+        """
+        with open(path, "rb") as f:
+            header = f.read(len(FILE_MAGIC) + 3)
+            if len(header) < len(FILE_MAGIC) + 3 or header[:len(FILE_MAGIC)] != FILE_MAGIC:
+                raise ValueError(f"{path} is not a strategy table file")
+            version, file_decks, file_h17 = header[len(FILE_MAGIC):]
+            if version != FILE_VERSION:
+                raise ValueError(f"{path} is version {version}, expected {FILE_VERSION}")
+            if num_decks is not None and file_decks != num_decks:
+                raise ValueError(f"{path} is for {file_decks} deck(s), not {num_decks}")
+            if hits_soft_17 is not None and bool(file_h17) != hits_soft_17:
+                raise ValueError(f"{path} is for another dealer rule on soft 17")
+            stand_ev = array("f")
+            hit_ev = array("f")
+            double_ev = array("f")
+            stand_ev.fromfile(f, TABLE_SIZE)
+            hit_ev.fromfile(f, TABLE_SIZE)
+            double_ev.fromfile(f, TABLE_SIZE)
+        return cls(file_decks, stand_ev, hit_ev, double_ev, bool(file_h17))
+
+
+# SOLVER
+
+def _stand_ev(total, dealer):
+    # dealer = probabilities in OUTCOMES order (17..21, bust)
+    ev = dealer[-1]  # dealer busts
+    for final, p in zip(OUTCOMES, dealer[:-1]):
+        if total > final:
+            ev += p
+        elif total < final:
+            ev -= p
+    return ev
+
+
+def solve(num_decks=1, dealer_odds=None, rules=None):
+    """
+    Build the StrategyTable for a shoe of `num_decks` decks.
+    """
+    dealer_odds = dealer_odds or DealerOdds(rules=rules)
+    stand_ev = array("f", [0.0]) * TABLE_SIZE
+    hit_ev = array("f", [0.0]) * TABLE_SIZE
+    double_ev = array("f", [0.0]) * TABLE_SIZE
+    full_shoe = shoe_counts(num_decks)
+
+    for upcard_value in UPCARD_VALUES:
+        up = _upcard_class(upcard_value)
+        counts = full_shoe[:up] + (full_shoe[up] - 1,) + full_shoe[up + 1:]
+        dealer = dealer_odds.final_probabilities(CLASS_HARD_VALUES[up], up == 0, counts)
+        remaining = sum(counts)
+        draw_p = [n / remaining for n in counts]
+
+        best_ev = {}  # (hard total, has ace) -> EV of playing on optimally
+
+        def play_ev(hard, ace):
+            # EV of a hand that can still choose to hit or stand
+            key = (hard, ace)
+            if key not in best_ev:
+                total = hard + 10 if ace and hard <= 11 else hard
+                best_ev[key] = max(_stand_ev(total, dealer), hit(hard, ace))
+            return best_ev[key]
+
+        def hit(hard, ace):
+            ev = 0.0
+            for value_class in range(VALUE_CLASSES):
+                new_hard = hard + CLASS_HARD_VALUES[value_class]
+                if new_hard > MAX_TOTAL:
+                    ev -= draw_p[value_class]  # player busts
+                else:
+                    ev += draw_p[value_class] * play_ev(new_hard, ace or value_class == 0)
+            return ev
+
+        def double(hard, ace):
+            # exactly one more card, then stand, for two bets
+            ev = 0.0
+            for value_class in range(VALUE_CLASSES):
+                new_hard = hard + CLASS_HARD_VALUES[value_class]
+                if new_hard > MAX_TOTAL:
+                    ev -= draw_p[value_class]
+                else:
+                    new_ace = ace or value_class == 0
+                    new_total = new_hard + 10 if new_ace and new_hard <= 11 else new_hard
+                    ev += draw_p[value_class] * _stand_ev(new_total, dealer)
+            return 2 * ev
+
+        for hard in range(2, MAX_TOTAL + 1):
+            for ace in (False, True):
+                total = hard + 10 if ace and hard <= 11 else hard
+                soft = total != hard
+                index = table_index(total, soft, upcard_value)
+                stand_ev[index] = _stand_ev(total, dealer)
+                hit_ev[index] = hit(hard, ace)
+                double_ev[index] = double(hard, ace)
+
+    return StrategyTable(num_decks, stand_ev, hit_ev, double_ev,
+                         dealer_odds.rules.dealer_hits_soft_17)
+
+
+# CACHED ACCESS
+
+_tables = {}
+
+
+def cache_path(num_decks, cache_dir=CACHE_DIR, hits_soft_17=False):
+    suffix = "_h17" if hits_soft_17 else ""
+    return os.path.join(cache_dir, f"strategy_{num_decks}d{suffix}.bin")
+
+
+def get_table(num_decks=1, cache_dir=CACHE_DIR, rules=None):
+    """
+    Return the table for `num_decks` (and the dealer rule in `rules`),
+    loading it from disk or solving (and saving) it the first time.
+    Later calls reuse the loaded table.
+    """
+    hits_soft_17 = (rules or DEFAULT_RULES).dealer_hits_soft_17
+    key = (num_decks, hits_soft_17)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    path = cache_path(num_decks, cache_dir, hits_soft_17)
+    try:
+        table = StrategyTable.load(path, num_decks, hits_soft_17)
+    except (OSError, ValueError, EOFError):
+        table = solve(num_decks, rules=rules)
+        try:
+            table.save(path)
+        except OSError:
+            pass  # read-only install - keep the solved table in memory only
+
+    _tables[key] = table
+    return table
+
+
+def add_table(table):
+    """
+    Keep a table solved elsewhere (e.g. in a worker process) for get_table().
+    """
+    _tables[(table.num_decks, table.hits_soft_17)] = table
+
+
+def loaded_table(num_decks=1, rules=None):
+    """
+    The table get_table() has already loaded or solved, or None - this
+    never solves, so it is safe to call where a solve would block (the GUI).
+    """
+    return _tables.get((num_decks, (rules or DEFAULT_RULES).dealer_hits_soft_17))
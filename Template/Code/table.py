@@ -0,0 +1,210 @@
+import random
+
+from cards import CARD_HARD_VALUES, CARD_IS_ACE
+from game_logic import (
+    OUTCOME_NET, HIT_ACTION, STAND_ACTION, DOUBLE_ACTION, SURRENDER_ACTION,
+    hand_outcome, outcome_net,
+)
+from hand import Hand
+from rules import DEFAULT_RULES
+from shoe import Shoe, worst_case_cards
+
+# MULTI-SEAT TABLE
+# Up to seven players ("seats") share one shoe and one dealer hand. The
+# whole initial deal is one slice of the shoe (Shoe.draw_many), dealt the
+# casino way: one card to each seat then the dealer, twice round. After the
+# seats have played, the dealer plays once and every seat is settled in one
+# pass against the dealer's final total.
+#
+# Headless play (play_round) also deals the seats' hits in one slice: with a
+# fixed stand-on total, how many cards each seat takes can be read straight
+# off the shoe, so hit_below() scans ahead with plain ints and then draws all
+# the hits with a single Shoe.draw_many instead of one draw per card.
+#
+# Hands hold card codes, not text - a table is for headless play
+# (simulations, servers); cards.CARD_NAMES turns a code into text.
+
+MIN_SEATS = 1
+MAX_SEATS = 7
+
+
+class Table:
+    def __init__(self, seats=1, num_decks=1, penetration=0.75, seed=None, rng=None, rules=None,
+                 shoe_source=None):
+        if not MIN_SEATS <= seats <= MAX_SEATS:
+            raise ValueError(f"seats must be between {MIN_SEATS} and {MAX_SEATS}")
+
+        self.seats = seats
+        self.rules = rules or DEFAULT_RULES
+
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self.shoe = Shoe(num_decks, penetration, rng, shoe_source)
+
+        # a round must never run out of cards mid-way: Shoe.draw would
+        # reshuffle cards that are still on the table
+        self.reserve = worst_case_cards(num_decks, seats + 1)
+        if self.reserve > len(self.shoe.cards):
+            raise ValueError(f"{num_decks} deck(s) can't cover a round at {seats} seats")
+
+        # per-seat stats: rounds by outcome code, and bets won (+) or lost (-)
+        self.seat_outcomes = [[0] * len(OUTCOME_NET) for _ in range(seats)]
+        self.seat_nets = [0.0] * seats
+        self.rounds_played = 0
+
+        self.new_round()
+
+    # ROUND MANAGEMENT
+
+    def new_round(self):
+        # reshuffle at the cut card, like Game21, or earlier when the worst
+        # case round would not fit in the cards left
+        if self.shoe.needs_shuffle or self.shoe.cards_remaining < self.reserve:
+            self.shoe.shuffle()
+        # seat hands are built by deal_initial_cards
+        self.hands = []
+        self.actions = [bytearray() for _ in range(self.seats)]
+        self.dealer_hand = Hand()
+        self.outcomes = None
+        self.nets = None
+
+    def deal_initial_cards(self):
+        """
+        Deal two cards to every seat and the dealer from one slice of the shoe.
+        The dealer's first card is the face-down one, as in Game21.
+        """
+        seats = self.seats
+        cards = self.shoe.draw_many(2 * (seats + 1))
+        second = seats + 1
+        self.hands = [Hand((cards[i], cards[second + i])) for i in range(seats)]
+        self.dealer_hand = Hand((cards[seats], cards[second + seats]))
+
+    # SEAT ACTIONS
+
+    def player_hit(self, seat):
+        code = self.shoe.draw()
+        self.hands[seat].append(code)
+        self.actions[seat] += HIT_ACTION
+        return code
+
+    def hit_below(self, player_stand_on):
+        """
+        Every seat, in order, hits until its total reaches `player_stand_on` -
+        the same cards as calling player_hit() one card at a time.
+        """
+        shoe = self.shoe
+        cards = shoe.cards
+        end = len(cards)
+        position = shoe.position
+        taken = []
+        for hand in self.hands:
+            hard = hand.hard_total
+            ace = hand.aces > 0
+            start = position
+            while (hard + 10 if ace and hard <= 11 else hard) < player_stand_on:
+                if position == end:
+                    # would run past the shoe (only without a reserve): deal one by one
+                    for seat, hand in enumerate(self.hands):
+                        while hand.total < player_stand_on:
+                            self.player_hit(seat)
+                    return
+                code = cards[position]
+                hard += CARD_HARD_VALUES[code]
+                ace = ace or CARD_IS_ACE[code]
+                position += 1
+            taken.append(position - start)
+
+        drawn = shoe.draw_many(position - shoe.position)
+        start = 0
+        for hand, actions, count in zip(self.hands, self.actions, taken):
+            if count:
+                hand.extend(drawn[start:start + count])
+                actions += HIT_ACTION * count
+                start += count
+
+    def can_double(self, seat):
+        return self.rules.allow_double and len(self.hands[seat]) == 2 and not self.actions[seat]
+
+    def can_surrender(self, seat):
+        return self.rules.allow_surrender and len(self.hands[seat]) == 2 and not self.actions[seat]
+
+    def player_double(self, seat):
+        # double the bet and take exactly one more card
+        if not self.can_double(seat):
+            raise ValueError("doubling is only allowed on the first two cards")
+        code = self.shoe.draw()
+        self.hands[seat].append(code)
+        self.actions[seat] += DOUBLE_ACTION
+        return code
+
+    def player_surrender(self, seat):
+        if not self.can_surrender(seat):
+            raise ValueError("surrender is only allowed on the first two cards")
+        self.actions[seat] += SURRENDER_ACTION
+
+    def seat_in_play(self, seat):
+        # still has a hand the dealer must beat
+        return not self.hands[seat].is_bust and not self.actions[seat].endswith(SURRENDER_ACTION)
+
+    # DEALER AND SETTLEMENT
+
+    def play_dealer_turn(self):
+        """
+        The dealer plays once for the whole table - not at all when every
+        seat has bust or surrendered.
+        """
+        live = False
+        for hand, actions in zip(self.hands, self.actions):
+            if hand.hard_total <= 21 and not actions.endswith(SURRENDER_ACTION):
+                actions += STAND_ACTION
+                live = True
+        if not live:
+            return
+        hits = self.rules.dealer_hits
+        hand = self.dealer_hand
+        draw = self.shoe.draw
+        while hits[hand.hard_total * 2 + (hand.aces > 0)]:
+            hand.append(draw())
+
+    def settle(self):
+        """
+        Settle every seat against the dealer's final total in one pass.
+        Updates the per-seat stats and returns the outcome codes, one per
+        seat (the bets won or lost are left in `nets`).
+        """
+        dealer_total = self.dealer_hand.total
+        rules = self.rules
+        # naturals only matter when the rules pay a bonus
+        payout = rules.blackjack_payout
+        dealer_natural = payout and self.dealer_hand.is_blackjack
+
+        outcomes = []
+        nets = []
+        seat_outcomes = self.seat_outcomes
+        seat_nets = self.seat_nets
+        for seat, (hand, actions) in enumerate(zip(self.hands, self.actions)):
+            # the same settlement as Game21 (game_logic.hand_outcome / outcome_net)
+            natural = payout and hand.is_blackjack
+            outcome = hand_outcome(hand.total, dealer_total, rules, natural, dealer_natural,
+                                   actions.endswith(SURRENDER_ACTION))
+            net = outcome_net(outcome, rules, 2 if DOUBLE_ACTION[0] in actions else 1, natural)
+            outcomes.append(outcome)
+            nets.append(net)
+            seat_outcomes[seat][outcome] += 1
+            seat_nets[seat] += net
+
+        self.rounds_played += 1
+        self.outcomes = outcomes
+        self.nets = nets
+        return outcomes
+
+    def play_round(self, player_stand_on=17):
+        """
+        Play one full round headless: every seat hits below `player_stand_on`,
+        then the dealer plays and the table is settled. Returns the outcomes.
+        """
+        self.new_round()
+        self.deal_initial_cards()
+        self.hit_below(player_stand_on)
+        self.play_dealer_turn()
+        return self.settle()
@@ -0,0 +1,122 @@
+from functools import lru_cache
+
+# THEME / STYLESHEETS
+# The window stylesheet never changes, so it is applied once. The status
+# label sheet depends on a setting, so it is built once per font size and
+# cached, and only applied to that label - re-applying the window stylesheet
+# re-polishes every widget in the window. Card faces are not styled here,
+# they are pre-rendered pixmaps (card_atlas.py).
+# Plain strings only - no PyQt import.
+
+TABLE_IMAGE_PATH = "./images/table_bg.jpg"
+
+# status label variants, selected with the "outcome" dynamic property
+STATUS_COLOURS = {
+    # outcome: (background, border, text)
+    "welcome": ("#145a32", "#f1c40f", "#f1c40f"),
+    "neutral": ("#145a32", "#f1c40f", "#f9f9f9"),
+    "lose": ("#7f1d1d", "#e74c3c", "#f9f9f9"),  # red-ish for bad outcome
+    "win": ("#145a32", "#2ecc71", "#f9f9f9"),  # green-ish for good outcome
+    "push": ("#7f6a1d", "#f1c40f", "#f9f9f9"),
+}
+
+WINDOW_STYLE = f"""
+    QMainWindow {{
+        background-color: #0b3b24; /* fallback */
+    }}
+    #centralWidget {{
+        background-color: #0b3b24;
+        background-image: url("{TABLE_IMAGE_PATH}");
+        background-repeat: no-repeat;
+        background-position: center;
+    }}
+    QGroupBox {{
+        border: 2px solid #1abc9c;
+        border-radius: 10px;
+        margin-top: 10px;
+        color: #ecf0f1;
+        font-weight: bold;
+        background-color: rgba(0,0,0,0.35);
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 14px;
+        padding: 0 6px;
+    }}
+    QLabel {{
+        color: #ecf0f1;
+        font-size: 13px;
+    }}
+    /* card faces are pixmaps; keep a gap between cards */
+    QLabel[card="true"] {{
+        margin-right: 8px;
+    }}
+    QPushButton {{
+        border-radius: 18px;
+        padding: 10px 28px;
+        font-weight: bold;
+        font-size: 15px;
+        color: #ffffff;
+    }}
+    QPushButton#hitButton {{
+        background-color: #27ae60;
+    }}
+    QPushButton#hitButton:hover:!disabled {{
+        background-color: #2ecc71;
+    }}
+    QPushButton#standButton {{
+        background-color: #c0392b;
+    }}
+    QPushButton#standButton:hover:!disabled {{
+        background-color: #e74c3c;
+    }}
+    QPushButton#newRoundButton {{
+        background-color: #2980b9;
+    }}
+    QPushButton#newRoundButton:hover:!disabled {{
+        background-color: #3498db;
+    }}
+    QPushButton:disabled {{
+        background-color: #555555;
+        color: #aaaaaa;
+    }}
+"""
+
+
+@lru_cache(maxsize=32)
+def status_stylesheet(status_font_size):
+    """
+    Stylesheet for the status label holding every outcome variant.
+    Switching outcome only changes the label's "outcome" property.
+    """
+    rules = [f"""
+    QLabel {{
+        font-size: {status_font_size}px;
+        font-weight: bold;
+        border-radius: 16px;
+        padding: 2px 18px;
+    }}"""]
+    for outcome, (background, border, text) in STATUS_COLOURS.items():
+        rules.append(f"""
+    QLabel[outcome="{outcome}"] {{
+        background-color: {background};
+        color: {text};
+        border: 2px solid {border};
+    }}""")
+    return "".join(rules)
+
+
+def outcome_style(result_text):
+    """
+    Map a decide_winner() message (or "neutral") to a status variant name.
+    """
+    if "Player busts" in result_text or result_text.startswith("Dealer wins") \
+            or "surrenders" in result_text:
+        return "lose"
+    if "Dealer busts" in result_text or result_text.startswith("Player wins"):
+        return "win"
+    if "Push" in result_text:
+        return "push"
+    if result_text in STATUS_COLOURS:
+        return result_text
+    return "neutral"